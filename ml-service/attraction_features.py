@@ -8,6 +8,95 @@ from db import get_db
 from sqlalchemy import text
 
 
+def _read_frame(query, params: dict) -> pd.DataFrame:
+    """
+    Materialize a query result straight into a DataFrame
+
+    pd.read_sql_query still fetches all rows at once (no chunksize), so
+    this is not streamed; the lookups are small whole-table reads, where a
+    server-side cursor would only add fetch round trips. Columns keep
+    NumPy dtypes for the categorical join and map downstream.
+    """
+    with get_db() as db:
+        return pd.read_sql_query(query, db.connection(), params=params)
+
+
+# Attraction metadata changes on the order of days, so whole-table lookups are
+# cached process-wide and every inference call after the first is a pure
+# in-memory join/map (same module-level TTL pattern as db.py)
+_attraction_types_cache = None
+_attraction_types_cache_time = None
+_park_counts_cache = None
+_park_counts_cache_time = None
+_lookup_cache_ttl = 900  # 15 minutes in seconds
+
+
+def _fetch_attraction_types() -> pd.DataFrame:
+    """
+    All attraction types, indexed by attractionId (cached for 15 minutes)
+
+    Returns:
+        DataFrame with an 'attraction_type' column and a unique
+        attractionId index. Shared with other callers: do not mutate.
+    """
+    global _attraction_types_cache, _attraction_types_cache_time
+    import time
+
+    if (
+        _attraction_types_cache is not None
+        and time.time() - _attraction_types_cache_time < _lookup_cache_ttl
+    ):
+        return _attraction_types_cache
+
+    query = text(
+        """
+        SELECT
+            id::text as "attractionId",
+            COALESCE("attractionType", 'UNKNOWN') as "attraction_type"
+        FROM attractions
+    """
+    )
+    type_df = _read_frame(query, {})
+    type_df = type_df.drop_duplicates("attractionId").set_index("attractionId")
+
+    _attraction_types_cache = type_df
+    _attraction_types_cache_time = time.time()
+    return type_df
+
+
+def _fetch_park_attraction_counts() -> pd.Series:
+    """
+    Number of attractions per park, indexed by parkId (cached for 15 minutes)
+
+    Returns:
+        Series of attraction counts. Shared with other callers: do not mutate.
+    """
+    global _park_counts_cache, _park_counts_cache_time
+    import time
+
+    if (
+        _park_counts_cache is not None
+        and time.time() - _park_counts_cache_time < _lookup_cache_ttl
+    ):
+        return _park_counts_cache
+
+    query = text(
+        """
+        SELECT
+            p.id::text as "parkId",
+            COUNT(DISTINCT a.id) as attraction_count
+        FROM parks p
+        LEFT JOIN attractions a ON a."parkId" = p.id
+        GROUP BY p.id
+    """
+    )
+    counts = _read_frame(query, {}).set_index("parkId")["attraction_count"]
+
+    _park_counts_cache = counts
+    _park_counts_cache_time = time.time()
+    return counts
+
+
 def add_attraction_type_feature(df: pd.DataFrame) -> pd.DataFrame:
     """
     Add attraction type feature from database
@@ -19,42 +108,30 @@ def add_attraction_type_feature(df: pd.DataFrame) -> pd.DataFrame:
         df: DataFrame with 'attractionId' column
 
     Returns:
-        DataFrame with 'attraction_type' column added
+        New DataFrame with 'attraction_type' column added (input is not
+        mutated; only the added column is allocated)
     """
-    df = df.copy()
-
     # Check if attractionType is already in DataFrame (from training data fetch)
     if "attractionType" in df.columns:
-        df["attraction_type"] = df["attractionType"].fillna("UNKNOWN").astype(str)
-        return df
+        return df.assign(
+            attraction_type=df["attractionType"].fillna("UNKNOWN").astype(str)
+        )
 
-    # Otherwise, fetch from database (for inference)
-    attraction_ids = df["attractionId"].unique().tolist()
-    if not attraction_ids:
-        df["attraction_type"] = "UNKNOWN"
-        return df
+    # Otherwise, look up in the cached attractions table (for inference)
+    if df.empty:
+        return df.assign(attraction_type="UNKNOWN")
 
     try:
-        query = text(
-            """
-            SELECT
-                id::text as "attractionId",
-                COALESCE("attractionType", 'UNKNOWN') as "attraction_type"
-            FROM attractions
-            WHERE id::text = ANY(:attraction_ids)
-        """
-        )
-
-        with get_db() as db:
-            result = db.execute(query, {"attraction_ids": attraction_ids})
-            type_df = pd.DataFrame(result.fetchall(), columns=result.keys())
+        type_df = _fetch_attraction_types()
 
         if not type_df.empty:
-            # Merge attraction types
-            df = df.merge(type_df, on="attractionId", how="left")
+            # Join against the small indexed side (works for categorical
+            # attractionId without decoding it to strings). many_to_one makes
+            # a duplicated id fail loudly instead of multiplying rows.
+            df = df.join(type_df, on="attractionId", how="left", validate="many_to_one")
             df["attraction_type"] = df["attraction_type"].fillna("UNKNOWN").astype(str)
         else:
-            df["attraction_type"] = "UNKNOWN"
+            df = df.assign(attraction_type="UNKNOWN")
     except Exception as e:
         import logging
 
@@ -62,7 +139,7 @@ def add_attraction_type_feature(df: pd.DataFrame) -> pd.DataFrame:
         logger.warning(
             f"Failed to fetch attraction types: {e}. Using default 'UNKNOWN'."
         )
-        df["attraction_type"] = "UNKNOWN"
+        df = df.assign(attraction_type="UNKNOWN")
 
     return df
 
@@ -81,52 +158,41 @@ def add_park_attraction_count_feature(
         parks_metadata: DataFrame with park metadata (may include attraction_count)
 
     Returns:
-        DataFrame with 'park_attraction_count' column added
+        New DataFrame with 'park_attraction_count' column added (input is not
+        mutated; only the added column is allocated)
     """
-    df = df.copy()
-
     # Check if attraction_count is in parks_metadata
     if "attraction_count" in parks_metadata.columns:
-        park_counts = parks_metadata.set_index("park_id")["attraction_count"].to_dict()
-        df["park_attraction_count"] = (
-            df["parkId"].map(lambda x: park_counts.get(str(x), 0)).fillna(0).astype(int)
+        # Vectorized hash lookup (no per-row Python lambda); keys normalized
+        # to str once on the small metadata side
+        park_counts = parks_metadata.set_index("park_id")["attraction_count"]
+        park_counts.index = park_counts.index.astype(str)
+        park_ids = df["parkId"]
+        if not pd.api.types.is_string_dtype(park_ids):
+            park_ids = park_ids.astype(str)
+        return df.assign(
+            park_attraction_count=park_ids.map(park_counts).fillna(0).astype("int32")
         )
-        return df
 
-    # Otherwise, fetch from database
-    park_ids = df["parkId"].unique().tolist()
-    if not park_ids:
-        df["park_attraction_count"] = 0
-        return df
+    # Otherwise, look up in the cached parks table
+    if df.empty:
+        return df.assign(park_attraction_count=0)
 
     try:
-        query = text(
-            """
-            SELECT
-                p.id::text as "parkId",
-                COUNT(DISTINCT a.id) as attraction_count
-            FROM parks p
-            LEFT JOIN attractions a ON a."parkId" = p.id
-            WHERE p.id::text = ANY(:park_ids)
-            GROUP BY p.id
-        """
-        )
-
-        with get_db() as db:
-            result = db.execute(query, {"park_ids": park_ids})
-            count_df = pd.DataFrame(result.fetchall(), columns=result.keys())
+        counts = _fetch_park_attraction_counts()
 
-        if not count_df.empty:
-            df = df.merge(count_df, on="parkId", how="left")
-            df["park_attraction_count"] = df["attraction_count"].fillna(0).astype(int)
-            df = df.drop(columns=["attraction_count"], errors="ignore")
+        if not counts.empty:
+            # Map instead of merge: no full-frame materialization for one column
+            df = df.assign(
+                park_attraction_count=df["parkId"].map(counts).fillna(0).astype("int32")
+            )
         else:
-            df["park_attraction_count"] = 0
+            df = df.assign(park_attraction_count=0)
     except Exception as e:
         import logging
 
         logger = logging.getLogger(__name__)
         logger.warning(f"Failed to fetch park attraction counts: {e}. Using default 0.")
-        df["park_attraction_count"] = 0
+        df = df.assign(park_attraction_count=0)
 
     return df
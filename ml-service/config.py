@@ -2,9 +2,19 @@
 Configuration for ML Service
 """
 
+import hashlib
+import os
+import pickle
+import stat
+import tempfile
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
 
+# Parsed-settings cache shared by all processes on the host (gunicorn workers,
+# the training subprocess, CLI scripts). Set to "" to disable.
+_SETTINGS_PICKLE = os.environ.get("PARKFAN_SETTINGS_CACHE", "/tmp/parkfan_settings.pkl")
+_ENV_FILE = ".env"
+
 
 class Settings(BaseSettings):
     """Application settings"""
@@ -177,7 +187,97 @@ class Settings(BaseSettings):
     )
 
 
+def _env_fingerprint() -> str:
+    """
+    Hash of this module's source and every env var that can override a field
+
+    Environment variables take precedence over .env, so a cached pickle is only
+    valid for the exact environment it was built from. The source hash ties it
+    to the Settings class too: a deploy that adds a field or changes a default
+    must not keep loading the pickle built by the previous code.
+    """
+    overrides = sorted(
+        (name, os.environ[name]) for name in Settings.model_fields if name in os.environ
+    )
+    digest = hashlib.sha256(repr(overrides).encode())
+    with open(__file__, "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _open_owned(path: str, flags: int) -> int:
+    """
+    Open path without following symlinks, only if it is ours and private
+
+    The cache lives in a shared, predictable location and unpickling runs
+    arbitrary code, so a file planted by another user must never be used.
+    """
+    fd = os.open(path, flags | os.O_NOFOLLOW, 0o600)
+    st = os.fstat(fd)
+    if st.st_uid != os.getuid() or st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        os.close(fd)
+        raise PermissionError(f"Refusing to use untrusted settings cache {path}")
+    return fd
+
+
+def _load_cached_settings(fingerprint: str):
+    """Return the pickled Settings if still fresh, else None"""
+    try:
+        fd = _open_owned(_SETTINGS_PICKLE, os.O_RDONLY)
+    except FileNotFoundError:
+        return None
+    with os.fdopen(fd, "rb") as f:
+        cache_mtime = os.fstat(fd).st_mtime
+        if os.path.exists(_ENV_FILE) and os.path.getmtime(_ENV_FILE) >= cache_mtime:
+            return None
+        cached_fingerprint, settings = pickle.load(f)
+    if cached_fingerprint != fingerprint or not isinstance(settings, Settings):
+        return None
+    return settings
+
+
+def _write_cached_settings(fingerprint: str, settings: Settings) -> None:
+    """Atomically replace the pickle (owner-only: it contains DB credentials)"""
+    cache_dir = os.path.dirname(_SETTINGS_PICKLE) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".parkfan_settings.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((fingerprint, settings), f)
+        os.replace(tmp_path, _SETTINGS_PICKLE)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
 @lru_cache()
 def get_settings() -> Settings:
-    """Get cached settings instance"""
-    return Settings()
+    """
+    Get cached settings instance
+
+    OPTIMIZATION: Besides the per-process lru_cache, the parsed settings are
+    pickled to _SETTINGS_PICKLE so cold-starting workers and CLI tools skip
+    re-reading and re-parsing .env. An exclusive flock makes concurrent worker
+    start-ups wait for the first writer instead of all parsing at once.
+    """
+    if not _SETTINGS_PICKLE:
+        return Settings()
+
+    try:
+        import fcntl
+
+        fingerprint = _env_fingerprint()
+        lock_fd = _open_owned(f"{_SETTINGS_PICKLE}.lock", os.O_WRONLY | os.O_CREAT)
+        with os.fdopen(lock_fd, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                settings = _load_cached_settings(fingerprint)
+                if settings is None:
+                    settings = Settings()
+                    _write_cached_settings(fingerprint, settings)
+                return settings
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+    except Exception:
+        # Cache is best-effort (read-only /tmp, no fcntl, stale pickle format,
+        # cache file owned by another user)
+        return Settings()
@@ -3,10 +3,255 @@ Data validation for ML training pipeline
 Ensures data quality before training
 """
 
+import json
+import logging
 import pandas as pd
 import numpy as np
-from datetime import timedelta
 from typing import Tuple, Dict, Any
+from outlier_kernels import NUMBA_AVAILABLE
+
+logger = logging.getLogger(__name__)
+
+# Minimum samples an attraction needs before its IQR bound is trusted
+IQR_MIN_SAMPLES = 10
+
+# Low-cardinality id columns stored as pandas categoricals from validation on
+ID_COLUMNS = ("attractionId", "parkId")
+
+# Statistical outliers must also exceed this wait (minutes) to be removed
+IQR_HARD_FLOOR = 200
+
+# dtype of the waitTime working array used by the row-level checks
+WAIT_DTYPE = np.float32
+
+
+def _segment_quantile(
+    sorted_values: np.ndarray, starts: np.ndarray, sizes: np.ndarray, q: float
+) -> np.ndarray:
+    """
+    Quantile of each contiguous segment of an already-sorted array
+
+    Uses linear interpolation between the two nearest ranks, matching
+    pandas' default `quantile` so bounds are bit-for-bit comparable. Segments
+    must hold only non-NaN values (pandas skips NaN) and be non-empty.
+    """
+    pos = (sizes - 1) * q
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.ceil(pos).astype(np.int64)
+    v_lo = sorted_values[starts + lo]
+    v_hi = sorted_values[starts + hi]
+    return v_lo + (v_hi - v_lo) * (pos - lo)
+
+
+def _quantiles(values: np.ndarray, qs: Tuple[float, ...]) -> np.ndarray:
+    """
+    Several quantiles of an unsorted array from a single np.partition
+
+    Same linear interpolation as np.percentile/np.median, but O(n) instead
+    of one full sort per call.
+    """
+    pos = (len(values) - 1) * np.asarray(qs, dtype=np.float64)
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.ceil(pos).astype(np.int64)
+    part = np.partition(values, np.unique(np.concatenate((lo, hi))))
+    return part[lo] + (part[hi] - part[lo]) * (pos - lo)
+
+
+def _wait_time_stats(wait: np.ndarray) -> Dict[str, float]:
+    """
+    Summary statistics of waitTime (same values as Series.describe())
+
+    NaN is skipped and std uses ddof=1, like pandas. min, the three quartiles
+    and max all come from one partition instead of describe()'s separate
+    passes.
+    """
+    nan = np.isnan(wait)
+    if nan.any():
+        wait = wait[~nan]
+    if len(wait) == 0:
+        return dict.fromkeys(("mean", "std", "min", "25%", "50%", "75%", "max"), np.nan)
+
+    q0, q25, q50, q75, q100 = _quantiles(wait, (0.0, 0.25, 0.5, 0.75, 1.0))
+    return {
+        "mean": wait.mean(),
+        "std": wait.std(ddof=1) if len(wait) > 1 else np.nan,
+        "min": q0,
+        "25%": q25,
+        "50%": q50,
+        "75%": q75,
+        "max": q100,
+    }
+
+
+def _span_days(ts: np.ndarray, empty: float = 0) -> float:
+    """Whole days between the first and last timestamp (NaT ignored)"""
+    ts = ts[~np.isnat(ts)]
+    if len(ts) == 0:
+        return empty
+    return int((ts.max() - ts.min()) // np.timedelta64(1, "D"))
+
+
+def _iqr_upper_bounds(codes: np.ndarray, wait: np.ndarray, n_groups: int) -> np.ndarray:
+    """
+    Per-row IQR upper bound (Q3 + 3*IQR) of the row's attraction
+
+    Sorts once by (attraction code, waitTime) so every attraction is a
+    contiguous, sorted segment; Q1/Q3 are then plain index gathers. NaN
+    waits are left out of the segments, as pandas' quantile skips them, but
+    still count towards IQR_MIN_SAMPLES like groupby().size(). Rows of
+    attractions with fewer samples, with no non-NaN wait, or with a missing
+    attractionId (code -1) get +inf so they are never flagged.
+
+    Args:
+        codes: Integer attraction codes from pd.factorize (-1 = missing)
+        wait: waitTime values aligned with codes
+        n_groups: Number of distinct attraction codes
+
+    Returns:
+        float64 array of upper bounds, aligned with codes
+    """
+    upper_per_row = np.full(len(codes), np.inf)
+    present = codes >= 0
+    if n_groups == 0 or not present.any():
+        return upper_per_row
+
+    keep = present & ~np.isnan(wait)
+    order = np.lexsort((wait, codes))
+    order = order[keep[order]]
+    sorted_codes = codes[order]
+    sorted_wait = wait[order]
+
+    starts = np.searchsorted(sorted_codes, np.arange(n_groups))
+    sizes = np.diff(np.r_[starts, len(sorted_codes)])
+    group_sizes = np.bincount(codes[present], minlength=n_groups)
+
+    upper_bounds = np.full(n_groups, np.inf)
+    valid = (group_sizes >= IQR_MIN_SAMPLES) & (sizes > 0)
+    if valid.any():
+        q1 = _segment_quantile(sorted_wait, starts[valid], sizes[valid], 0.25)
+        q3 = _segment_quantile(sorted_wait, starts[valid], sizes[valid], 0.75)
+        upper_bounds[valid] = q3 + 3 * (q3 - q1)
+
+    upper_per_row[present] = upper_bounds[codes[present]]
+    return upper_per_row
+
+
+def _statistical_outlier_mask(
+    codes: np.ndarray, wait: np.ndarray, n_groups: int
+) -> np.ndarray:
+    """
+    Rows above their attraction's Q3 + 3*IQR and above IQR_HARD_FLOOR
+
+    Only rows above IQR_HARD_FLOOR can ever be flagged, and only attractions
+    with at least IQR_MIN_SAMPLES rows are checked, so quartiles are computed
+    just for eligible attractions with at least one such row (usually a
+    small minority); everything else is excluded before the sort. Runs the
+    compiled Numba kernel (parallel over attractions) when numba is
+    installed, otherwise the NumPy sorted-segment implementation.
+    """
+    mask = np.zeros(len(wait), dtype=bool)
+    present = codes >= 0
+    candidates = (wait > IQR_HARD_FLOOR) & present
+    if not candidates.any():
+        return mask
+
+    has_candidate = np.zeros(n_groups, dtype=bool)
+    has_candidate[codes[candidates]] = True
+    has_candidate &= np.bincount(codes[present], minlength=n_groups) >= IQR_MIN_SAMPLES
+    if not has_candidate.any():
+        return mask
+
+    rows = np.flatnonzero(present)
+    rows = rows[has_candidate[codes[rows]]]
+    sub_codes = codes[rows]
+    sub_wait = wait[rows]
+
+    if NUMBA_AVAILABLE:
+        from outlier_kernels import iqr_mask
+
+        counts = np.bincount(sub_codes, minlength=n_groups)
+        order = np.argsort(sub_codes, kind="stable")
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        mask[rows] = iqr_mask(
+            order, sub_wait, starts, counts, IQR_MIN_SAMPLES, float(IQR_HARD_FLOOR)
+        )
+        return mask
+
+    upper_per_row = _iqr_upper_bounds(sub_codes, sub_wait, n_groups)
+    mask[rows] = (sub_wait > upper_per_row) & (sub_wait > IQR_HARD_FLOOR)
+    return mask
+
+
+def _combine_outlier_masks(
+    wait: np.ndarray, statistical: np.ndarray, max_wait: float
+) -> Tuple[np.ndarray, int, int, int, int]:
+    """
+    Union of the negative, > max_wait and statistical outlier checks
+
+    With numba the three checks, the union and all four counts are one
+    parallel pass over the rows; otherwise NumPy masks and sums.
+
+    Returns:
+        Tuple of (outlier mask, negative count, extreme-high count,
+        statistical count, outlier count)
+    """
+    if NUMBA_AVAILABLE:
+        from outlier_kernels import combine_outlier_masks
+
+        mask, *counts = combine_outlier_masks(wait, statistical, float(max_wait))
+        return (mask, *(int(c) for c in counts))
+
+    negative = wait < 0
+    extreme_high = wait > max_wait
+    mask = negative | extreme_high | statistical
+    return (
+        mask,
+        int(negative.sum()),
+        int(extreme_high.sum()),
+        int(statistical.sum()),
+        int(mask.sum()),
+    )
+
+
+def _sorted_unique_rows(
+    sort_codes: np.ndarray, ts: np.ndarray, rows: np.ndarray
+) -> Tuple[np.ndarray, int]:
+    """
+    Order `rows` by (attraction, timestamp) and drop duplicate keys
+
+    One stable lexsort (skipped when the rows are already in order) yields
+    the final sort order, and duplicates become adjacent, so they are found
+    with a shifted comparison instead of a hash table. Within a run of equal
+    keys the earliest input row comes first, so it is the one kept
+    (drop_duplicates(keep="first") semantics).
+
+    Args:
+        sort_codes: Category codes of attractionId (missing mapped past the end)
+        ts: Timestamps as int64 (NaT mapped past the end)
+        rows: Row positions to consider, in input order
+
+    Returns:
+        Tuple of (sorted positions of the kept rows, number of duplicates)
+    """
+    sorted_codes = sort_codes[rows]
+    sorted_ts = ts[rows]
+    # Linear check first: input that is already in (attraction, timestamp)
+    # order skips the O(n log n) lexsort entirely
+    in_order = (sorted_codes[1:] > sorted_codes[:-1]) | (
+        (sorted_codes[1:] == sorted_codes[:-1]) & (sorted_ts[1:] >= sorted_ts[:-1])
+    )
+    if in_order.all():
+        order = rows
+    else:
+        perm = np.lexsort((sorted_ts, sorted_codes))
+        order = rows[perm]
+        sorted_codes = sorted_codes[perm]
+        sorted_ts = sorted_ts[perm]
+    repeat = np.zeros(len(order), dtype=bool)
+    repeat[1:] = (sorted_codes[1:] == sorted_codes[:-1]) & (
+        sorted_ts[1:] == sorted_ts[:-1]
+    )
+    return order[~repeat], int(repeat.sum())
 
 
 def validate_training_data(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Any]]:
@@ -21,145 +266,168 @@ def validate_training_data(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, An
     5. Check for data distribution issues
 
     Returns:
-        Tuple of (cleaned_df, validation_report)
+        Tuple of (cleaned_df, validation_report). cleaned_df is the input
+        frame itself (id columns converted to categoricals) when no row had
+        to be removed or reordered.
     """
     if df.empty:
         return df, {"status": "empty", "issues": []}
 
     initial_count = len(df)
+
+    # Dictionary-encode the id columns once (int codes instead of per-row
+    # Python strings): every factorize/isin/sort below then works on codes,
+    # and the encoding is kept for the downstream feature pipeline.
+    for col in ID_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
     issues = []
 
-    print(f"\n{'=' * 60}")
-    print("🔍 Data Validation Pipeline")
-    print(f"{'=' * 60}\n")
-    print(f"📊 Initial dataset: {initial_count:,} rows")
+    # Step-by-step diagnostics are DEBUG output: check the level once and skip
+    # building (formatting, quantiles, example rows) when it is off
+    verbose = logger.isEnabledFor(logging.DEBUG)
+
+    if verbose:
+        logger.debug(f"\n{'=' * 60}")
+        logger.debug("🔍 Data Validation Pipeline")
+        logger.debug(f"{'=' * 60}\n")
+        logger.debug(f"📊 Initial dataset: {initial_count:,} rows")
 
     # 1. Remove extreme outliers (likely sensor/API errors)
-    print("\n1️⃣  Checking for extreme outliers...")
+    logger.debug("\n1️⃣  Checking for extreme outliers...")
+
+    # OPTIMIZED: All row-level checks (negative, > MAX_WAIT_TIME, IQR, duplicate
+    # timestamps) run on NumPy arrays and are fused into a single keep mask,
+    # so the frame is filtered/copied once instead of once per check
+    # The three hot columns are extracted once as plain arrays; every step
+    # below (including the report) works on these or on gathers of them,
+    # never on the frame's columns again.
+    # attractionId is categorical at this point: its codes are the group keys
+    # (-1 = missing), no factorize hash needed
+    codes = df["attractionId"].cat.codes.to_numpy()
+    n_attractions = len(df["attractionId"].cat.categories)
+    ts_values = df["timestamp"].values
+    wait_values = df["waitTime"].to_numpy(dtype=np.float64)
+    # float32 working copy: half the bytes per mask/sort pass. waitTime is an
+    # hourly PERCENTILE_CONT median (whole or half minutes, NaN possible), so
+    # int16 would truncate, but float32 holds these values exactly.
+    wait = wait_values.astype(WAIT_DTYPE)
 
     # Step 1: Remove negative wait times (always invalid)
-    negative_mask = df["waitTime"] < 0
-    negative_count = negative_mask.sum()
-
     # Step 2: Remove extremely high wait times (likely sensor errors)
     # Increased from 300 to 400 minutes (6.6 hours) to account for very busy days
     # Some popular attractions can legitimately have 5-6 hour waits on peak days
     MAX_WAIT_TIME = 400  # 6.6 hours - longer is likely an error
-    extreme_high_mask = df["waitTime"] > MAX_WAIT_TIME
 
     # Step 3: Statistical outlier detection per attraction (IQR method)
     # This catches values that are outliers relative to each attraction's normal range
     # e.g., if an attraction normally has 30-60 min waits, a sudden 400 min is suspicious
-    # OPTIMIZED: Use vectorized groupby operations instead of loops
+    # OPTIMIZED: Q1/Q3 per contiguous attraction segment (Numba kernel when
+    # available; no groupby, no Series.map back)
     import time
 
     outlier_start = time.time()
 
-    statistical_outliers = pd.Series(False, index=df.index)
-
-    if len(df) > 0:
-        # Vectorized approach: Calculate IQR bounds per attraction using groupby
-        # This is much faster than looping (O(n) vs O(n*m))
-        attraction_groups = df.groupby("attractionId")["waitTime"]
-
-        # Get group sizes to filter attractions with at least 10 samples
-        group_sizes = attraction_groups.size()
-        valid_attraction_ids = group_sizes[group_sizes >= 10].index
-
-        if len(valid_attraction_ids) > 0:
-            # Calculate Q1, Q3, IQR for each attraction (only for valid ones)
-            Q1 = attraction_groups.quantile(0.25)
-            Q3 = attraction_groups.quantile(0.75)
-            IQR = Q3 - Q1
-
-            # Calculate upper bound (Q3 + 3*IQR) for each attraction
-            upper_bounds = Q3 + 3 * IQR
-
-            # Map upper bounds back to dataframe rows
-            df["_upper_bound"] = df["attractionId"].map(upper_bounds)
-
-            # Flag outliers: waitTime > upper_bound AND waitTime > 200
-            # Only check attractions with enough data
-            mask_valid = df["attractionId"].isin(valid_attraction_ids)
-            statistical_outliers = (
-                mask_valid
-                & (df["waitTime"] > df["_upper_bound"])
-                & (df["waitTime"] > 200)
-            )
-
-            # Clean up temporary column
-            df.drop(columns=["_upper_bound"], inplace=True, errors="ignore")
+    # Flag outliers: waitTime > upper_bound AND waitTime > 200
+    # Only attractions with at least 10 samples are checked
+    statistical_outliers = _statistical_outlier_mask(codes, wait, n_attractions)
 
     outlier_time = time.time() - outlier_start
     if outlier_time > 1.0:  # Only log if it takes more than 1 second
-        print(f"   Outlier detection time: {outlier_time:.2f}s")
+        logger.debug("   Outlier detection time: %.2fs", outlier_time)
 
-    # Combine all outlier masks
-    outlier_mask = negative_mask | extreme_high_mask | statistical_outliers
-    outliers_count = outlier_mask.sum()
+    # Combine all outlier masks (steps 1-3 and their counts in one pass)
+    (
+        outlier_mask,
+        negative_count,
+        extreme_high_count,
+        statistical_count,
+        outliers_count,
+    ) = _combine_outlier_masks(wait, statistical_outliers, MAX_WAIT_TIME)
 
     if outliers_count > 0:
         breakdown = {
             "negative": negative_count,
-            "extreme_high": extreme_high_mask.sum(),
-            "statistical": statistical_outliers.sum(),
+            "extreme_high": extreme_high_count,
+            "statistical": statistical_count,
         }
 
         issue_msg = f"Removed {outliers_count} extreme outliers"
         if negative_count > 0:
             issue_msg += f" ({negative_count} negative"
-        if extreme_high_mask.sum() > 0:
-            issue_msg += f", {extreme_high_mask.sum()} > {MAX_WAIT_TIME} min"
-        if statistical_outliers.sum() > 0:
-            issue_msg += f", {statistical_outliers.sum()} statistical outliers"
+        if extreme_high_count > 0:
+            issue_msg += f", {extreme_high_count} > {MAX_WAIT_TIME} min"
+        if statistical_count > 0:
+            issue_msg += f", {statistical_count} statistical outliers"
         if negative_count > 0:
             issue_msg += ")"
 
         issues.append(issue_msg)
-        print(f"   ⚠️  Found {outliers_count} extreme outliers")
-        print(f"      Breakdown: {breakdown}")
+        if verbose:
+            logger.debug(f"   ⚠️  Found {outliers_count} extreme outliers")
+            logger.debug(f"      Breakdown: {breakdown}")
 
-        # Show examples
-        if outliers_count <= 10:
+        # Show examples (only materialized when debug logging is on)
+        if verbose and outliers_count <= 10:
             extreme_values = df.loc[outlier_mask, ["attractionId", "waitTime"]].values
-            print(f"   Examples: {extreme_values}")
-        elif outliers_count <= 50:
+            logger.debug(f"   Examples: {extreme_values}")
+        elif verbose and outliers_count <= 50:
             # Show summary statistics
-            extreme_wait_times = df.loc[outlier_mask, "waitTime"]
-            print(
+            extreme_wait_times = wait[outlier_mask]
+            logger.debug(
                 f"   Wait time range: {extreme_wait_times.min():.1f} - {extreme_wait_times.max():.1f} min"
             )
-            print(
-                f"   Mean: {extreme_wait_times.mean():.1f} min, Median: {extreme_wait_times.median():.1f} min"
+            logger.debug(
+                f"   Mean: {extreme_wait_times.mean():.1f} min, Median: {np.median(extreme_wait_times):.1f} min"
             )
 
-    df = df[~outlier_mask].copy()
-    print(f"   ✓ Retained {len(df):,} rows after outlier removal")
+    keep = ~outlier_mask
+    if verbose:
+        logger.debug(
+            f"   ✓ Retained {len(wait) - outliers_count:,} rows after outlier removal"
+        )
 
-    # 2. Remove duplicate timestamps per attraction
-    print("\n2️⃣  Checking for duplicate timestamps...")
-    duplicates_before = len(df)
-    df = df.drop_duplicates(subset=["attractionId", "timestamp"], keep="first")
-    duplicates_removed = duplicates_before - len(df)
+    # 2. Remove duplicate timestamps per attraction (among rows that survived
+    # the outlier checks, keeping the first in input order)
+    # OPTIMIZED: Sort first (the final (attractionId, timestamp) order needed
+    # anyway), then duplicates are adjacent rows: no drop_duplicates hash and
+    # no separate sort_values later. Missing ids / NaT sort last, like
+    # sort_values.
+    logger.debug("\n2️⃣  Checking for duplicate timestamps...")
+    sort_codes = np.where(codes < 0, n_attractions, codes)
+    ts = ts_values.view("i8")
+    nat = np.isnat(ts_values)
+    if nat.any():
+        ts = np.where(nat, np.iinfo(np.int64).max, ts)
+    sorted_rows, duplicates_removed = _sorted_unique_rows(
+        sort_codes, ts, np.flatnonzero(keep)
+    )
 
     if duplicates_removed > 0:
         issues.append(f"Removed {duplicates_removed} duplicate timestamp entries")
-        print(f"   ⚠️  Removed {duplicates_removed} duplicates")
+        logger.debug("   ⚠️  Removed %d duplicates", duplicates_removed)
     else:
-        print("   ✓ No duplicates found")
+        logger.debug("   ✓ No duplicates found")
 
     # 3. Check attractions with insufficient data
-    print("\n3️⃣  Checking data sufficiency per attraction...")
+    logger.debug("\n3️⃣  Checking data sufficiency per attraction...")
 
     # Adaptive threshold based on data availability
     # For early-stage systems with limited data, use lower threshold
-    total_attractions = df["attractionId"].nunique()
-    attraction_counts = df.groupby("attractionId").size()
+    # OPTIMIZED: Runs on the surviving row positions (the frame is not
+    # materialized until all filters are known). bincount over the category
+    # codes instead of groupby().size(); missing ids (code -1) are excluded,
+    # same as groupby. The rows are sorted by code, so ascending code order
+    # is also the order attractions appear in the output.
+    kept_codes = codes[sorted_rows]
+    code_counts = np.bincount(kept_codes[kept_codes >= 0], minlength=n_attractions)
+    present_codes = np.flatnonzero(code_counts)
+    attraction_counts = code_counts[present_codes]
+    uniques = df["attractionId"].cat.categories[present_codes]
+    total_attractions = len(uniques)
 
     # Calculate data span to determine appropriate threshold
-    data_span_days = (
-        (df["timestamp"].max() - df["timestamp"].min()).days if len(df) > 0 else 0
-    )
+    data_span_days = _span_days(ts_values[sorted_rows])
 
     # Adaptive threshold: Lower for systems with limited historical data
     # Also considers data distribution to avoid filtering out too many attractions
@@ -182,9 +450,10 @@ def validate_training_data(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, An
 
     # Adjust threshold based on actual data distribution
     # If median samples per attraction is low, don't be too aggressive
+    MIN_SAMPLES_PER_ATTRACTION = base_threshold
+    adjusted = False
     if len(attraction_counts) > 0:
-        median_samples = attraction_counts.median()
-        q25_samples = attraction_counts.quantile(0.25)
+        q25_samples, median_samples = _quantiles(attraction_counts, (0.25, 0.5))
 
         # If median is very low (e.g., offseason), use a more lenient threshold
         # This prevents filtering out too many attractions when transitioning to 30+ days
@@ -195,169 +464,182 @@ def validate_training_data(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, An
 
             if adjusted_threshold < base_threshold:
                 MIN_SAMPLES_PER_ATTRACTION = adjusted_threshold
-                print(f"   📊 Data span: {data_span_days} days ({stage})")
-                print(
-                    f"   📊 Data distribution: median={median_samples:.1f}, Q25={q25_samples:.1f}"
-                )
-                print(
-                    f"   Using adjusted threshold: {MIN_SAMPLES_PER_ATTRACTION} samples per attraction"
-                )
-                print(
-                    f"   (Adjusted from {base_threshold} due to limited data distribution - likely offseason)"
-                )
-            else:
-                MIN_SAMPLES_PER_ATTRACTION = base_threshold
-                print(f"   📊 Data span: {data_span_days} days ({stage})")
-                print(
-                    f"   Using threshold: {MIN_SAMPLES_PER_ATTRACTION} samples per attraction"
-                )
+                adjusted = True
+
+    if verbose:
+        logger.debug(f"   📊 Data span: {data_span_days} days ({stage})")
+        if adjusted:
+            logger.debug(
+                f"   📊 Data distribution: median={median_samples:.1f}, Q25={q25_samples:.1f}"
+            )
+            logger.debug(
+                f"   Using adjusted threshold: {MIN_SAMPLES_PER_ATTRACTION} samples per attraction"
+            )
+            logger.debug(
+                f"   (Adjusted from {base_threshold} due to limited data distribution - likely offseason)"
+            )
         else:
-            MIN_SAMPLES_PER_ATTRACTION = base_threshold
-            print(f"   📊 Data span: {data_span_days} days ({stage})")
-            print(
+            logger.debug(
                 f"   Using threshold: {MIN_SAMPLES_PER_ATTRACTION} samples per attraction"
             )
-    else:
-        MIN_SAMPLES_PER_ATTRACTION = base_threshold
-        print(f"   📊 Data span: {data_span_days} days ({stage})")
-        print(
-            f"   Using threshold: {MIN_SAMPLES_PER_ATTRACTION} samples per attraction"
-        )
 
-    insufficient_attractions = attraction_counts[
-        attraction_counts < MIN_SAMPLES_PER_ATTRACTION
-    ]
+    sufficient = attraction_counts >= MIN_SAMPLES_PER_ATTRACTION
+    insufficient_attractions = uniques[~sufficient]
 
     if len(insufficient_attractions) > 0:
         # Calculate statistics about removed attractions
-        removed_counts = insufficient_attractions.values
+        removed_counts = attraction_counts[~sufficient]
         removed_rows = removed_counts.sum()
 
         # Show distribution of removed attractions
-        print(
-            f"   ⚠️  Found {len(insufficient_attractions)} attractions with < {MIN_SAMPLES_PER_ATTRACTION} samples"
-        )
-        print(f"   Total rows from removed attractions: {removed_rows:,}")
-
-        if len(insufficient_attractions) <= 20:
-            # Show details for small number of attractions
-            print(f"   Removed attractions (samples): {dict(insufficient_attractions)}")
-        else:
-            # Show statistics for larger sets
-            print("   Sample distribution of removed attractions:")
-            print(f"      Min: {removed_counts.min()}, Max: {removed_counts.max()}")
-            print(
-                f"      Median: {np.median(removed_counts):.1f}, Mean: {removed_counts.mean():.1f}"
-            )
-            print(
-                f"      Q25: {np.percentile(removed_counts, 25):.1f}, Q75: {np.percentile(removed_counts, 75):.1f}"
+        if verbose:
+            logger.debug(
+                f"   ⚠️  Found {len(insufficient_attractions)} attractions with < {MIN_SAMPLES_PER_ATTRACTION} samples"
             )
+            logger.debug(f"   Total rows from removed attractions: {removed_rows:,}")
+
+            if len(insufficient_attractions) <= 20:
+                # Show details for small number of attractions
+                logger.debug(
+                    f"   Removed attractions (samples): {dict(zip(insufficient_attractions, removed_counts.tolist()))}"
+                )
+            else:
+                # Show statistics for larger sets
+                q25, q50, q75 = _quantiles(removed_counts, (0.25, 0.5, 0.75))
+                logger.debug("   Sample distribution of removed attractions:")
+                logger.debug(
+                    f"      Min: {removed_counts.min()}, Max: {removed_counts.max()}"
+                )
+                logger.debug(
+                    f"      Median: {q50:.1f}, Mean: {removed_counts.mean():.1f}"
+                )
+                logger.debug(f"      Q25: {q25:.1f}, Q75: {q75:.1f}")
 
         issues.append(
             f"Removed {len(insufficient_attractions)} attractions with < {MIN_SAMPLES_PER_ATTRACTION} samples ({removed_rows:,} rows)"
         )
 
-        # Remove insufficient attractions
-        valid_attractions = attraction_counts[
-            attraction_counts >= MIN_SAMPLES_PER_ATTRACTION
-        ].index
-        df = df[df["attractionId"].isin(valid_attractions)].copy()
+        # Remove insufficient attractions: a per-code lookup table gathered by
+        # each row's code (no hash set). The extra trailing False slot is what
+        # code -1 (missing id) indexes.
+        sufficient_by_code = np.zeros(n_attractions + 1, dtype=bool)
+        sufficient_by_code[present_codes[sufficient]] = True
+        sorted_rows = sorted_rows[sufficient_by_code[kept_codes]]
     else:
-        print("   ✓ All attractions have sufficient data")
-
-    remaining_attractions = df["attractionId"].nunique() if len(df) > 0 else 0
+        logger.debug("   ✓ All attractions have sufficient data")
+
+    # Materialize once: a single take() applies the outlier filter, the dedup,
+    # the sufficiency filter and the sort (take() also leaves no
+    # SettingWithCopy link behind). Input that is already clean and sorted is
+    # passed through without a copy.
+    if len(sorted_rows) < len(df) or (np.diff(sorted_rows) < 0).any():
+        df = df.take(sorted_rows)
+        codes = codes[sorted_rows]
+        ts_values = ts_values[sorted_rows]
+        wait_values = wait_values[sorted_rows]
+    final_count = len(sorted_rows)
+
+    # Known from the sufficiency counts: no nunique() hash pass over the rows
+    remaining_attractions = int(sufficient.sum())
     removed_count = total_attractions - remaining_attractions
 
-    if remaining_attractions > 0:
-        valid_counts = attraction_counts[
-            attraction_counts >= MIN_SAMPLES_PER_ATTRACTION
-        ]
-        print(
+    if remaining_attractions > 0 and verbose:
+        valid_counts = attraction_counts[sufficient]
+        q25, q50, q75 = _quantiles(valid_counts, (0.25, 0.5, 0.75))
+        logger.debug(
             f"   ✓ Training on {remaining_attractions} attractions (removed {removed_count})"
         )
-        print("   Sample distribution of kept attractions:")
-        print(f"      Min: {valid_counts.min()}, Max: {valid_counts.max()}")
-        print(
-            f"      Median: {np.median(valid_counts.values):.1f}, Mean: {valid_counts.mean():.1f}"
-        )
-        print(
-            f"      Q25: {np.percentile(valid_counts.values, 25):.1f}, Q75: {np.percentile(valid_counts.values, 75):.1f}"
-        )
-    else:
-        print("   ⚠️  WARNING: No attractions remain after filtering!")
+        logger.debug("   Sample distribution of kept attractions:")
+        logger.debug(f"      Min: {valid_counts.min()}, Max: {valid_counts.max()}")
+        logger.debug(f"      Median: {q50:.1f}, Mean: {valid_counts.mean():.1f}")
+        logger.debug(f"      Q25: {q25:.1f}, Q75: {q75:.1f}")
+    elif remaining_attractions == 0:
+        logger.warning("⚠️  No attractions remain after validation filtering!")
 
     # 4. Verify timestamp consistency (check for time order issues)
-    print("\n4️⃣  Checking timestamp consistency...")
-    df = df.sort_values(["attractionId", "timestamp"])
+    logger.debug("\n4️⃣  Checking timestamp consistency...")
+    # Already sorted by (attractionId, timestamp) in step 2
 
     # Check for backwards time jumps
-    time_diff = df.groupby("attractionId")["timestamp"].diff()
-    negative_diffs = (time_diff < timedelta(0)).sum()
+    # OPTIMIZED: One np.diff over the sorted timestamps, masked to pairs of
+    # adjacent rows of the same attraction (no groupby, no Timedelta Series).
+    # Group boundaries come from the category codes (no factorize hash);
+    # datetime64 compare so NaT never counts as a jump.
+    same_group = codes[1:] == codes[:-1]
+    negative_diffs = int(((np.diff(ts_values) < np.timedelta64(0)) & same_group).sum())
 
     if negative_diffs > 0:
         issues.append(
             f"Found {negative_diffs} backward time jumps (resolved by sorting)"
         )
-        print(f"   ⚠️  Found {negative_diffs} backward time jumps (fixed by sorting)")
+        logger.debug(
+            "   ⚠️  Found %d backward time jumps (fixed by sorting)", negative_diffs
+        )
     else:
-        print("   ✓ Timestamps are consistent")
+        logger.debug("   ✓ Timestamps are consistent")
 
     # 5. Check data distribution
-    print("\n5️⃣  Analyzing data distribution...")
+    logger.debug("\n5️⃣  Analyzing data distribution...")
 
     # Wait time statistics
-    wait_stats = df["waitTime"].describe()
-    print("   Wait Time Distribution:")
-    print(f"      Mean: {wait_stats['mean']:.1f} min")
-    print(f"      Median: {wait_stats['50%']:.1f} min")
-    print(f"      Std: {wait_stats['std']:.1f} min")
-    print(f"      Q25-Q75: {wait_stats['25%']:.1f} - {wait_stats['75%']:.1f} min")
+    wait_stats = _wait_time_stats(wait_values)
+    if verbose:
+        logger.debug("   Wait Time Distribution:")
+        logger.debug(f"      Mean: {wait_stats['mean']:.1f} min")
+        logger.debug(f"      Median: {wait_stats['50%']:.1f} min")
+        logger.debug(f"      Std: {wait_stats['std']:.1f} min")
+        logger.debug(
+            f"      Q25-Q75: {wait_stats['25%']:.1f} - {wait_stats['75%']:.1f} min"
+        )
 
     # Check for suspicious patterns
-    zero_wait_pct = (df["waitTime"] == 0).sum() / len(df) * 100
+    zero_wait_pct = (
+        np.count_nonzero(wait_values == 0) / final_count * 100 if final_count else 0.0
+    )
     if zero_wait_pct > 50:
         issues.append(f"High percentage of zero wait times: {zero_wait_pct:.1f}%")
-        print(f"   ⚠️  High percentage of zero wait times: {zero_wait_pct:.1f}%")
+        logger.debug("   ⚠️  High percentage of zero wait times: %.1f%%", zero_wait_pct)
 
     # 6. Temporal coverage check
-    print("\n6️⃣  Checking temporal coverage...")
-    date_range = (df["timestamp"].max() - df["timestamp"].min()).days
-    print(f"   Time span: {date_range} days")
+    logger.debug("\n6️⃣  Checking temporal coverage...")
+    date_range = _span_days(ts_values, empty=np.nan)
+    logger.debug("   Time span: %s days", date_range)
 
     if date_range < 30:
         issues.append(f"Limited temporal coverage: only {date_range} days")
-        print(f"   ⚠️  Limited data span: {date_range} days (< 30 days)")
+        logger.debug("   ⚠️  Limited data span: %s days (< 30 days)", date_range)
     else:
-        print(f"   ✓ Good temporal coverage: {date_range} days")
+        logger.debug("   ✓ Good temporal coverage: %s days", date_range)
 
     # Final report
-    print(f"\n{'=' * 60}")
-    print("📋 Validation Summary")
-    print(f"{'=' * 60}")
-    print(f"Initial rows:    {initial_count:,}")
-    print(f"Final rows:      {len(df):,}")
-    print(
-        f"Rows removed:    {initial_count - len(df):,} ({(initial_count - len(df)) / initial_count * 100:.2f}%)"
-    )
-    print(f"Issues found:    {len(issues)}")
+    if verbose:
+        logger.debug(f"\n{'=' * 60}")
+        logger.debug("📋 Validation Summary")
+        logger.debug(f"{'=' * 60}")
+        logger.debug(f"Initial rows:    {initial_count:,}")
+        logger.debug(f"Final rows:      {final_count:,}")
+        logger.debug(
+            f"Rows removed:    {initial_count - final_count:,} ({(initial_count - final_count) / initial_count * 100:.2f}%)"
+        )
+        logger.debug(f"Issues found:    {len(issues)}")
 
-    if issues:
-        print("\nIssues:")
-        for i, issue in enumerate(issues, 1):
-            print(f"   {i}. {issue}")
-    else:
-        print("\n✅ No issues found - data is clean!")
+        if issues:
+            logger.debug("\nIssues:")
+            for i, issue in enumerate(issues, 1):
+                logger.debug(f"   {i}. {issue}")
+        else:
+            logger.debug("\n✅ No issues found - data is clean!")
 
-    print(f"{'=' * 60}\n")
+        logger.debug(f"{'=' * 60}\n")
 
     validation_report = {
         "status": "success",
         "initial_rows": initial_count,
-        "final_rows": len(df),
-        "rows_removed": initial_count - len(df),
-        "removal_percentage": (initial_count - len(df)) / initial_count * 100,
+        "final_rows": final_count,
+        "rows_removed": initial_count - final_count,
+        "removal_percentage": (initial_count - final_count) / initial_count * 100,
         "issues": issues,
-        "attractions_count": len(df.groupby("attractionId")),
+        "attractions_count": remaining_attractions,
         "temporal_span_days": date_range,
         "wait_time_stats": {
             "mean": float(wait_stats["mean"]),
@@ -368,4 +650,14 @@ def validate_training_data(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, An
         },
     }
 
+    # One structured line for log aggregation instead of the step-by-step
+    # console output (which is still available at DEBUG level)
+    logger.info("validation_report=%s", json.dumps(validation_report))
+
+    # Drop categories of removed attractions so downstream groupbys only see
+    # ids that are actually present
+    for col in ID_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].cat.remove_unused_categories()
+
     return df, validation_report
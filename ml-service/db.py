@@ -22,36 +22,44 @@ def convert_df_types(df: pd.DataFrame) -> pd.DataFrame:
     - uuid.UUID -> str
     - datetime.date/datetime.datetime -> pd.to_datetime
     """
-    if df.empty:
+    # Only object columns can hold Decimal/UUID/date values; reading the
+    # dtypes avoids building a select_dtypes() sub-frame, and frames with
+    # none (all-numeric fetches, SQL-side casts) return right away
+    object_cols = [
+        col for col, dtype in df.dtypes.items() if pd.api.types.is_object_dtype(dtype)
+    ]
+    if df.empty or not object_cols:
         return df
 
-    for col in df.columns:
-        if df[col].dtype == "object":
-            sample = df[col].dropna()
-            if sample.empty:
-                continue
-
-            first_val = sample.iloc[0]
-
-            try:
-                # 1. Decimal -> Float
-                if isinstance(first_val, decimal.Decimal):
-                    df[col] = df[col].astype(float)
-                # 2. UUID -> String
-                elif isinstance(first_val, uuid.UUID):
-                    df[col] = df[col].astype(str)
-                # 3. Date/Datetime -> Timestamp (ML features need standard pandas types)
-                elif isinstance(first_val, (datetime.date, datetime.datetime)):
-                    try:
-                        df[col] = pd.to_datetime(df[col], utc=True)
-                    except Exception as conv_error:
-                        print(
-                            f"⚠️  Warning: Failed to convert datetime column {col}: {conv_error}"
-                        )
-                        # Keep original values if conversion fails
-                        pass
-            except Exception as e:
-                print(f"⚠️  Warning: Failed to convert column {col}: {e}")
+    for col in object_cols:
+        values = df[col].to_numpy()
+        # Probe the first non-null value without materializing dropna()
+        valid = pd.notna(values)
+        first = valid.argmax()
+        if not valid[first]:
+            continue
+
+        first_val = values[first]
+
+        try:
+            # 1. Decimal -> Float
+            if isinstance(first_val, decimal.Decimal):
+                df[col] = df[col].astype(float)
+            # 2. UUID -> String
+            elif isinstance(first_val, uuid.UUID):
+                df[col] = df[col].astype(str)
+            # 3. Date/Datetime -> Timestamp (ML features need standard pandas types)
+            elif isinstance(first_val, (datetime.date, datetime.datetime)):
+                try:
+                    df[col] = pd.to_datetime(df[col], utc=True)
+                except Exception as conv_error:
+                    print(
+                        f"⚠️  Warning: Failed to convert datetime column {col}: {conv_error}"
+                    )
+                    # Keep original values if conversion fails
+                    pass
+        except Exception as e:
+            print(f"⚠️  Warning: Failed to convert column {col}: {e}")
 
     return df
 
@@ -84,12 +92,156 @@ def get_db() -> Generator:
         db.close()
 
 
+# Rows per round trip when a large result is streamed from a server-side cursor
+FETCH_CHUNK_ROWS = 50_000
+
+
+def _fetch_frame(
+    query, params: Dict = None, chunk_size: int = None, dtypes: Dict = None
+) -> pd.DataFrame:
+    """
+    Run a text() query on a raw DBAPI cursor and build a DataFrame
+
+    Skips SQLAlchemy's per-row Row construction: the psycopg2 tuples go
+    straight into DataFrame.from_records. The statement is compiled by the
+    engine's dialect, so :name bind parameters keep working unchanged.
+
+    Args:
+        query: text() statement
+        params: Bind parameters
+        chunk_size: If set, stream the result through a server-side (named)
+            cursor chunk_size rows per round trip. Each chunk becomes its own
+            DataFrame before the next one is fetched, so only one chunk of
+            Python tuples is alive at a time; the frames are concatenated at
+            the end.
+        dtypes: Column dtypes applied to every chunk. Fixing them up front
+            keeps a chunk whose column is all NULL from coming back as object
+            and turning the concatenated column into object too. Columns not
+            in the result are ignored.
+    """
+    sql = str(query.compile(dialect=engine.dialect))
+    raw_conn = engine.raw_connection()
+    try:
+        if chunk_size is None:
+            with raw_conn.cursor() as cur:
+                cur.execute(sql, params or {})
+                columns = [col.name for col in cur.description]
+                rows = cur.fetchall()
+            df = pd.DataFrame.from_records(rows, columns=columns)
+        else:
+            frames = []
+            with raw_conn.cursor(name="fetch_frame") as cur:
+                cur.execute(sql, params or {})
+                while True:
+                    chunk = cur.fetchmany(chunk_size)
+                    if not chunk:
+                        break
+                    # Named cursors only describe their columns after a FETCH
+                    columns = [col.name for col in cur.description]
+                    frame = pd.DataFrame.from_records(chunk, columns=columns)
+                    if dtypes:
+                        frame = frame.astype(
+                            {col: dt for col, dt in dtypes.items() if col in columns}
+                        )
+                    frames.append(frame)
+                columns = [col.name for col in cur.description]
+            if not frames:
+                return pd.DataFrame.from_records([], columns=columns)
+            df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    finally:
+        raw_conn.close()
+    return df
+
+
+def _copy_frame(query, params: Dict = None, parse_dates=()) -> pd.DataFrame:
+    """
+    Run a text() query through COPY ... TO STDOUT (CSV) and parse it in pandas
+
+    The server streams one CSV buffer that pandas' C parser turns into
+    columns directly: no per-row tuple and no per-cell Python object.
+    Values come back as CSV text, so NULLs become NaN (not None) and
+    timestamp columns must be listed in parse_dates.
+    """
+    import io
+
+    sql = str(query.compile(dialect=engine.dialect))
+    buf = io.BytesIO()
+    raw_conn = engine.raw_connection()
+    try:
+        with raw_conn.cursor() as cur:
+            # COPY takes no bind parameters: let the driver inline them
+            select_sql = cur.mogrify(sql, params or {}).decode()
+            cur.copy_expert(
+                f"COPY (\n{select_sql}\n) TO STDOUT WITH (FORMAT CSV, HEADER)", buf
+            )
+    finally:
+        raw_conn.close()
+
+    buf.seek(0)
+    # Only the empty field is NULL: names like "NA" or "None" stay strings
+    df = pd.read_csv(buf, keep_default_na=False, na_values=[""])
+    for col in parse_dates:
+        df[col] = pd.to_datetime(df[col], utc=True, format="ISO8601")
+    return df
+
+
+# Raw readings above this are sensor/API errors and never reach pandas
+# (validate_training_data additionally drops hourly medians > 400 min)
+MAX_RAW_WAIT_TIME = 600
+
+# Floor of validate_training_data's adaptive per-attraction sample threshold
+# (it never goes below 10), so filtering at this level in SQL only drops
+# attractions the Python check would drop anyway
+MIN_SAMPLES_PER_ATTRACTION = 10
+
+# Known dtypes of the training query, applied in one astype pass:
+# - ids: a few hundred distinct values repeated over millions of rows, stored
+#   as category codes instead of one Python str pointer per row
+# - calendar fields fit in one byte
+# - weatherCode (WMO 0-99) is NULL when no weather row matched, hence the
+#   nullable integer type
+TRAINING_SCHEMA = {
+    "attractionId": "category",
+    "parkId": "category",
+    "hour": "uint8",
+    "day_of_week": "uint8",
+    "month": "uint8",
+    "season": "uint8",
+    "opening_hour": "uint8",
+    "weatherCode": "Int16",
+}
+
+# Per-chunk dtypes for the streamed training fetch. Categoricals are left to
+# the final astype(TRAINING_SCHEMA): chunks with different categories would
+# concatenate back to object.
+TRAINING_CHUNK_DTYPES = {
+    **{col: dt for col, dt in TRAINING_SCHEMA.items() if dt != "category"},
+    "waitTime": "float64",
+    "temperatureMax": "float64",
+    "temperatureMin": "float64",
+    "precipitation": "float64",
+    "snowfallSum": "float64",
+    "windSpeedMax": "float64",
+}
+
+
 def fetch_training_data(
-    start_date: datetime.datetime, end_date: datetime.datetime
+    start_date: datetime.datetime,
+    end_date: datetime.datetime,
+    min_samples_per_attraction: int = MIN_SAMPLES_PER_ATTRACTION,
+    method: str = "cursor",
 ) -> pd.DataFrame:
     """
     Fetch historical queue data, weather, holidays for training
 
+    Hard outlier and sufficiency filters are pushed into the query: raw waits
+    above MAX_RAW_WAIT_TIME are excluded, and attractions with fewer than
+    min_samples_per_attraction hourly rows are dropped before transfer.
+
+    method="copy" transfers the result with COPY ... TO STDOUT and parses
+    it with pandas' CSV reader instead of building Python row tuples
+    (opt-in; NULL text columns come back as NaN rather than None).
+
     Returns DataFrame with columns:
     - attraction_id
     - park_id
@@ -139,17 +291,16 @@ def fetch_training_data(
                 PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY qd."waitTime") as "waitTime",
                 -- NEW: Downtime signal (count occurrences of DOWN status in this hour)
                 COUNT(CASE WHEN qd.status = 'DOWN' THEN 1 END) as downtime_count,
-                MAX(EXTRACT(HOUR FROM qd.timestamp AT TIME ZONE p.timezone)) as hour,
-                MAX(EXTRACT(DOW FROM qd.timestamp AT TIME ZONE p.timezone)) as day_of_week,
-                MAX(EXTRACT(MONTH FROM qd.timestamp AT TIME ZONE p.timezone)) as month,
+                -- EXTRACT returns NUMERIC: cast here so the driver hands back
+                -- ints instead of Decimal objects converted row by row in pandas
+                MAX(EXTRACT(HOUR FROM qd.timestamp AT TIME ZONE p.timezone))::smallint as hour,
+                MAX(EXTRACT(DOW FROM qd.timestamp AT TIME ZONE p.timezone))::smallint as day_of_week,
+                MAX(EXTRACT(MONTH FROM qd.timestamp AT TIME ZONE p.timezone))::smallint as month,
                 -- Dynamic opening hour for heartbeat filtering (default to 9am if unknown)
-                COALESCE(MAX(EXTRACT(HOUR FROM se."openingTime" AT TIME ZONE p.timezone)), 9) as opening_hour,
-                MAX(CASE
-                    WHEN EXTRACT(MONTH FROM qd.timestamp AT TIME ZONE p.timezone) IN (12, 1, 2) THEN 0
-                    WHEN EXTRACT(MONTH FROM qd.timestamp AT TIME ZONE p.timezone) IN (3, 4, 5) THEN 1
-                    WHEN EXTRACT(MONTH FROM qd.timestamp AT TIME ZONE p.timezone) IN (6, 7, 8) THEN 2
-                    ELSE 3
-                END) as season
+                COALESCE(MAX(EXTRACT(HOUR FROM se."openingTime" AT TIME ZONE p.timezone)), 9)::smallint as opening_hour,
+                -- Season without branching: (month % 12) / 3 maps Dec-Feb -> 0,
+                -- Mar-May -> 1, Jun-Aug -> 2, Sep-Nov -> 3 (same as predict.py)
+                MAX((EXTRACT(MONTH FROM qd.timestamp AT TIME ZONE p.timezone)::int % 12) / 3)::smallint as season
             FROM queue_data qd
             INNER JOIN attractions a ON a.id = qd."attractionId"
             INNER JOIN parks p ON p.id = a."parkId"
@@ -176,6 +327,7 @@ def fetch_training_data(
                 AND qd.timestamp BETWEEN :start_date AND :end_date
                 AND qd."waitTime" IS NOT NULL
                 AND qd."waitTime" >= 5
+                AND qd."waitTime" <= :max_wait_time
                 AND (
                     se."scheduleType" = 'OPERATING'        -- confirmed operating
                     OR (se."scheduleType" IS NULL AND odh.day IS NOT NULL) -- No schedule in DB + heuristic says open
@@ -188,6 +340,14 @@ def fetch_training_data(
                 a."attractionType",
                 DATE_TRUNC('hour', qd.timestamp)
         ),
+        sufficient_attractions AS (
+            -- Attractions with too few hourly samples are removed by validation
+            -- anyway; dropping them here saves the transfer + allocation
+            SELECT "attractionId"
+            FROM hourly_queue
+            GROUP BY "attractionId"
+            HAVING COUNT(*) >= :min_samples
+        ),
         weather_daily AS (
             SELECT
                 "parkId",
@@ -202,15 +362,29 @@ def fetch_training_data(
             WHERE date BETWEEN :start_date AND :end_date
                 AND "dataType" = 'historical'
         )
+        -- Explicit list (no hq.*): helper columns added to the CTEs must not
+        -- silently ride along to pandas for every row
         SELECT
-            hq.*,
-            wd."temperatureMax",
-            wd."temperatureMin",
-            wd."precipitationSum" as precipitation,
-            wd."snowfallSum" as "snowfallSum",
-            wd."windSpeedMax" as "windSpeedMax",
+            hq."attractionId",
+            hq."attractionName",
+            hq."parkId",
+            hq."attractionType",
+            hq.timestamp,
+            hq."waitTime",
+            hq.downtime_count,
+            hq.hour,
+            hq.day_of_week,
+            hq.month,
+            hq.opening_hour,
+            hq.season,
+            wd."temperatureMax"::float8 as "temperatureMax",
+            wd."temperatureMin"::float8 as "temperatureMin",
+            wd."precipitationSum"::float8 as precipitation,
+            wd."snowfallSum"::float8 as "snowfallSum",
+            wd."windSpeedMax"::float8 as "windSpeedMax",
             wd."weatherCode"
         FROM hourly_queue hq
+        INNER JOIN sufficient_attractions sa ON sa."attractionId" = hq."attractionId"
         LEFT JOIN weather_daily wd ON wd."parkId" = hq."parkId"
             AND DATE(hq.timestamp) = wd.date
         -- No ORDER BY: feature engineering re-sorts the DataFrame by its own keys
@@ -224,21 +398,39 @@ def fetch_training_data(
 
     start_time = time.time()
 
-    with get_db() as db:
-        result = db.execute(query, {"start_date": start_date, "end_date": end_date})
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-        query_time = time.time() - start_time
-        print(f"   Query execution time: {query_time:.2f}s")
-
-        # Sanity guard: log the distinct ratable park count feeding training.
-        # Baselines run on the daily cron ahead of the train and ~118 parks
-        # have one, so the INNER JOIN on park_p50_baselines won't starve
-        # training — a sudden drop here flags a baseline-pipeline regression.
-        if not df.empty and "parkId" in df.columns:
-            park_count = df["parkId"].nunique()
-            print(f"   Training data spans {park_count} ratable parks")
+    params = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "max_wait_time": MAX_RAW_WAIT_TIME,
+        "min_samples": min_samples_per_attraction,
+    }
+    if method == "copy":
+        df = _copy_frame(query, params, parse_dates=("timestamp",))
+    elif method == "cursor":
+        df = _fetch_frame(
+            query, params, chunk_size=FETCH_CHUNK_ROWS, dtypes=TRAINING_CHUNK_DTYPES
+        )
+    else:
+        raise ValueError(f"Unknown fetch method: {method}")
+    query_time = time.time() - start_time
+    print(f"   Query execution time: {query_time:.2f}s")
+
+    # Sanity guard: log the distinct ratable park count feeding training.
+    # Baselines run on the daily cron ahead of the train and ~118 parks
+    # have one, so the INNER JOIN on park_p50_baselines won't starve
+    # training — a sudden drop here flags a baseline-pipeline regression.
+    if not df.empty and "parkId" in df.columns:
+        park_count = df["parkId"].nunique()
+        print(f"   Training data spans {park_count} ratable parks")
+
+    df = convert_df_types(df)
+    return df.astype(
+        {col: dt for col, dt in TRAINING_SCHEMA.items() if col in df.columns}
+    )
 
-        return convert_df_types(df)
+
+# Max attraction ids per fetch_queue_aggregates round trip
+QUEUE_AGGREGATES_BATCH_SIZE = 500
 
 
 def fetch_queue_aggregates(
@@ -272,57 +464,107 @@ def fetch_queue_aggregates(
         # Default: last 7 days for general ML features
         lookback_hours = list(range(0, 24 * 7, 24))  # Every 24h for 7 days
 
-    # Calculate exact timestamps to fetch
-    target_timestamps = []
-    for hours in lookback_hours:
-        ts = target_hour - datetime.timedelta(hours=hours)
-        # Truncate to hour
-        ts = ts.replace(minute=0, second=0, microsecond=0)
-        target_timestamps.append(ts)
+    # Calculate exact timestamps to fetch (truncated to the hour); lookbacks
+    # that collapse onto the same hour are only sent once, newest first
+    target_timestamps = sorted(
+        {
+            (target_hour - datetime.timedelta(hours=hours)).replace(
+                minute=0, second=0, microsecond=0
+            )
+            for hours in lookback_hours
+        },
+        reverse=True,
+    )
 
     query = text(
         """
         SELECT
-            "attractionId" as attraction_id,
-            hour,
-            p25,
-            p50,
-            p75,
-            p90,
-            p95,
-            p99,
-            iqr,
-            "stdDev" as std_dev,
-            mean,
-            "sampleCount" as sample_count,
-            EXTRACT(EPOCH FROM (:target_hour - hour)) / 3600 as hours_ago
-        FROM queue_data_aggregates
-        WHERE "attractionId" = ANY(:attraction_ids)
-          AND hour = ANY(:target_hours)
-        ORDER BY "attractionId", hour DESC
+            q."attractionId" as attraction_id,
+            q.hour,
+            q.p25::float8 as p25,
+            q.p50::float8 as p50,
+            q.p75::float8 as p75,
+            q.p90::float8 as p90,
+            q.p95::float8 as p95,
+            q.p99::float8 as p99,
+            q.iqr::float8 as iqr,
+            q."stdDev"::float8 as std_dev,
+            q.mean::float8 as mean,
+            q."sampleCount" as sample_count,
+            (EXTRACT(EPOCH FROM (:target_hour - q.hour)) / 3600)::float8 as hours_ago
+        -- Explicit (attraction, hour) pairs: one probe of the
+        -- ("attractionId", hour) index per pair instead of a bitmap scan
+        -- over every row matching either ANY() list
+        FROM (
+            SELECT DISTINCT unnest(CAST(:attraction_ids AS uuid[])) AS "attractionId"
+        ) ids
+        CROSS JOIN (
+            SELECT DISTINCT unnest(CAST(:target_hours AS timestamptz[])) AS hour
+        ) hours
+        INNER JOIN queue_data_aggregates q
+            ON q."attractionId" = ids."attractionId"
+            AND q.hour = hours.hour
+        ORDER BY q."attractionId", q.hour DESC
     """
     )
 
-    with engine.connect() as conn:
-        result = conn.execute(
+    def fetch_batch(batch_ids: List[str]) -> pd.DataFrame:
+        return _fetch_frame(
             query,
             {
-                "attraction_ids": attraction_ids,
+                "attraction_ids": batch_ids,
                 "target_hours": target_timestamps,
                 "target_hour": target_hour,
             },
         )
-        data = pd.DataFrame(result.fetchall(), columns=result.keys())
+
+    if len(attraction_ids) <= QUEUE_AGGREGATES_BATCH_SIZE:
+        data = fetch_batch(attraction_ids)
+    else:
+        # Huge id arrays get bad plans: split into independent batches, each
+        # on its own pooled connection. Ids are de-duplicated first so no
+        # attraction can land in two batches and be returned twice.
+        from concurrent.futures import ThreadPoolExecutor
+
+        unique_ids = list(dict.fromkeys(attraction_ids))
+        batches = [
+            unique_ids[i : i + QUEUE_AGGREGATES_BATCH_SIZE]
+            for i in range(0, len(unique_ids), QUEUE_AGGREGATES_BATCH_SIZE)
+        ]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            frames = list(pool.map(fetch_batch, batches))
+        # Restore the query's ORDER BY across batch boundaries
+        data = pd.concat(frames, ignore_index=True).sort_values(
+            ["attraction_id", "hour"], ascending=[True, False], ignore_index=True
+        )
 
     return convert_df_types(data)
 
 
+# Cache for park influencing countries (5 minute TTL)
+_influencing_countries_cache = None
+_influencing_countries_cache_time = None
+_influencing_countries_cache_ttl = 300  # 5 minutes in seconds
+
+
 def fetch_park_influencing_countries() -> Dict[str, List[str]]:
     """
     Fetch park influencing countries mapping
 
+    OPTIMIZATION: Caches result for 5 minutes; park settings change rarely.
+
     Returns: {park_id: [country_codes]}
     """
+    global _influencing_countries_cache, _influencing_countries_cache_time
+    import time
+
+    if (
+        _influencing_countries_cache is not None
+        and time.time() - _influencing_countries_cache_time
+        < _influencing_countries_cache_ttl
+    ):
+        return dict(_influencing_countries_cache)
+
     query = text(
         """
         SELECT
@@ -335,7 +577,11 @@ def fetch_park_influencing_countries() -> Dict[str, List[str]]:
 
     with get_db() as db:
         result = db.execute(query)
-        return {row.park_id: row.countries for row in result}
+        countries = {row.park_id: row.countries for row in result}
+
+    _influencing_countries_cache = countries
+    _influencing_countries_cache_time = time.time()
+    return dict(countries)
 
 
 # Cache for holidays (never changes for past dates)
@@ -388,24 +634,22 @@ def fetch_holidays(
     """
     )
 
-    with get_db() as db:
-        result = db.execute(
-            query,
-            {
-                "countries": country_codes,
-                "start_date": start_date,
-                "end_date": end_date,
-            },
-        )
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-        df = convert_df_types(df)
+    df = _fetch_frame(
+        query,
+        {
+            "countries": country_codes,
+            "start_date": start_date,
+            "end_date": end_date,
+        },
+    )
+    df = convert_df_types(df)
 
-        # Update cache
-        import time
+    # Update cache
+    import time
 
-        _holidays_cache[cache_key] = (df.copy(), time.time())
+    _holidays_cache[cache_key] = (df.copy(), time.time())
 
-        return df
+    return df
 
 
 # Cache for parks metadata (5 minute TTL)
@@ -419,12 +663,14 @@ def fetch_parks_metadata(use_cache: bool = True) -> pd.DataFrame:
     Fetch park metadata (country code, influencing regions, etc.)
 
     OPTIMIZATION: Caches result for 5 minutes to avoid repeated DB queries
-    during prediction batches.
+    during prediction batches. The cached frame itself is returned (no copy
+    per call), so callers that need to modify it must .copy() first.
 
     Args:
         use_cache: If True, use cached result if available and fresh
 
-    Returns DataFrame with park details
+    Returns DataFrame with park details. Shared with other callers: do not
+    mutate.
     """
     global _parks_metadata_cache, _parks_metadata_cache_time
 
@@ -438,7 +684,7 @@ def fetch_parks_metadata(use_cache: bool = True) -> pd.DataFrame:
 
         age = time.time() - _parks_metadata_cache_time
         if age < _parks_metadata_cache_ttl:
-            return _parks_metadata_cache.copy()
+            return _parks_metadata_cache
 
     query = text(
         """
@@ -450,8 +696,8 @@ def fetch_parks_metadata(use_cache: bool = True) -> pd.DataFrame:
             p.timezone,
             p."influencingRegions", 
             p."influenceRadiusKm",
-            p.latitude,
-            p.longitude,
+            p.latitude::float8 as latitude,
+            p.longitude::float8 as longitude,
             COUNT(DISTINCT a.id) as attraction_count
         FROM parks p
         LEFT JOIN attractions a ON a."parkId" = p.id
@@ -460,19 +706,17 @@ def fetch_parks_metadata(use_cache: bool = True) -> pd.DataFrame:
     """
     )
 
-    with get_db() as db:
-        result = db.execute(query)
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-        df = convert_df_types(df)
+    df = _fetch_frame(query)
+    df = convert_df_types(df)
 
-        # Update cache
-        if use_cache:
-            import time
+    # Update cache
+    if use_cache:
+        import time
 
-            _parks_metadata_cache = df.copy()
-            _parks_metadata_cache_time = time.time()
+        _parks_metadata_cache = df
+        _parks_metadata_cache_time = time.time()
 
-        return df
+    return df
 
 
 # Cache for park schedules (short-lived, 5 minutes)
@@ -540,23 +784,21 @@ def fetch_park_schedules(
     """
     )
 
-    with get_db() as db:
-        # Extract date() from datetime objects for SQL query
-        # Note: If start_date/end_date are timezone-aware, .date() extracts the date
-        # in that timezone. For correct behavior, ensure dates are in park local timezone.
-        # The caller (add_park_schedule_features) should handle timezone conversion.
-        result = db.execute(
-            query, {"start_date": start_date.date(), "end_date": end_date.date()}
-        )
-        df = pd.DataFrame(result.fetchall(), columns=result.keys())
-        df = convert_df_types(df)
+    # Extract date() from datetime objects for SQL query
+    # Note: If start_date/end_date are timezone-aware, .date() extracts the date
+    # in that timezone. For correct behavior, ensure dates are in park local timezone.
+    # The caller (add_park_schedule_features) should handle timezone conversion.
+    df = _fetch_frame(
+        query, {"start_date": start_date.date(), "end_date": end_date.date()}
+    )
+    df = convert_df_types(df)
 
-        # Update cache
-        import time
+    # Update cache
+    import time
 
-        _schedules_cache[cache_key] = (df.copy(), time.time())
+    _schedules_cache[cache_key] = (df.copy(), time.time())
 
-        return df
+    return df
 
 
 # Cache for historical park occupancy (1 hour TTL)
@@ -752,8 +994,8 @@ def fetch_prediction_errors_for_training(
         SELECT
             pa."attraction_id" as "attractionId",
             pa."target_time" as timestamp,
-            pa."absolute_error",
-            pa."percentage_error"
+            pa."absolute_error"::float8 as absolute_error,
+            pa."percentage_error"::float8 as percentage_error
         FROM prediction_accuracy pa
         WHERE pa."comparison_status" = 'COMPLETED'
             AND pa."target_time" BETWEEN :start_date AND :end_date
@@ -763,10 +1005,13 @@ def fetch_prediction_errors_for_training(
     )
 
     try:
-        with get_db() as db:
-            result = db.execute(query, {"start_date": start_date, "end_date": end_date})
-            df = pd.DataFrame(result.fetchall(), columns=result.keys())
-            return convert_df_types(df)
+        df = _fetch_frame(
+            query,
+            {"start_date": start_date, "end_date": end_date},
+            chunk_size=FETCH_CHUNK_ROWS,
+            dtypes={"absolute_error": "float64", "percentage_error": "float64"},
+        )
+        return convert_df_types(df)
     except Exception as e:
         print(f"⚠️  Failed to fetch prediction errors: {e}")
         print("   Training without sample weights (using uniform weights)")
@@ -810,7 +1055,7 @@ def fetch_attraction_baselines() -> pd.DataFrame:
     SELECT 
         "attractionId" as attraction_id, 
         "parkId" as park_id, 
-        "p50Baseline" as p50_baseline
+        "p50Baseline"::float8 as p50_baseline
     FROM attraction_p50_baselines
     """
     with get_db() as db:
@@ -827,7 +1072,7 @@ def fetch_attraction_accuracy() -> pd.DataFrame:
     query = """
     SELECT 
         attraction_id, 
-        mae
+        mae::float8 as mae
     FROM attraction_accuracy_stats
     WHERE compared_predictions >= 5
     """
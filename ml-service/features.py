@@ -5,6 +5,7 @@ Feature engineering for ML model
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta, time
+from functools import lru_cache
 from typing import Dict, List
 from db import (
     fetch_holidays,
@@ -12,13 +13,46 @@ from db import (
     fetch_park_schedules,
     fetch_attraction_baselines,
 )
-from holiday_utils import normalize_region_code, calculate_holiday_info
+from holiday_utils import normalize_region_code
 from config import get_settings
 from percentile_features import add_percentile_features
+from window_kernels import NUMBA_AVAILABLE
 from attraction_features import (
     add_park_attraction_count_feature,
 )
 
+# Final dtypes of the flag/count and continuous features that are built as
+# Python ints/floats (int64/float64), applied once at the end of engineer_features
+FEATURE_DTYPES = {
+    # 0/1 flags and small counts
+    "is_park_open": np.int8,
+    "has_special_event": np.int8,
+    "has_extra_hours": np.int8,
+    "has_virtual_queue": np.int8,
+    "had_downtime_today": np.int8,
+    "park_has_schedule": np.int8,
+    "is_bridge_day": np.int8,
+    "is_long_weekend": np.int8,
+    "holiday_count_total": np.int8,
+    "school_holiday_count_total": np.int8,
+    "neighbor_school_holiday_count": np.int8,
+    "is_coaster": np.int8,
+    "is_water_ride": np.int8,
+    "is_indoor": np.int8,
+    "is_wind_sensitive": np.int8,
+    "is_temp_extreme": np.int8,
+    "is_wind_extreme": np.int8,
+    # Continuous
+    "park_occupancy_pct": np.float32,
+    "time_since_park_open_mins": np.float32,
+    "downtime_minutes_today": np.float32,
+    "days_until_next_holiday": np.float32,
+    "days_since_last_holiday": np.float32,
+    "wait_time_velocity": np.float32,
+    "holiday_occupancy_interaction": np.float32,
+    "hour_occupancy_interaction": np.float32,
+}
+
 
 def convert_to_local_time(
     df: pd.DataFrame, parks_metadata: pd.DataFrame
@@ -44,22 +78,36 @@ def convert_to_local_time(
     # Create map {parkId: timezone_str}
     tz_map = parks_metadata.set_index("park_id")["timezone"].to_dict()
 
-    # We need a 'local_timestamp' column for features
-    # Group by parkId once to avoid O(n*k) boolean masking over the full DataFrame
-    df["local_timestamp"] = df["timestamp"]  # Default to UTC
-
-    for park_id, idx in df.groupby("parkId").groups.items():
+    # We need a 'local_timestamp' column for features.
+    # Stored as naive local wall time (datetime64[ns]): a single tz-aware column
+    # cannot hold several timezones, and writing a converted slice back into the
+    # UTC column silently casts it back to UTC. Instant comparisons (opening
+    # times, schedules) use the tz-aware 'timestamp' column instead.
+    timestamps = df["timestamp"]
+    local_values = timestamps.dt.tz_localize(None).to_numpy()  # Default to UTC
+
+    # Group by parkId once; each row is converted exactly once
+    for park_id, positions in df.groupby(
+        "parkId", observed=True, sort=False
+    ).indices.items():
         tz_name = tz_map.get(park_id)
         if not tz_name:
             continue
 
         try:
-            df.loc[idx, "local_timestamp"] = df.loc[idx, "timestamp"].dt.tz_convert(
-                tz_name
+            local_values[positions] = (
+                timestamps.iloc[positions]
+                .dt.tz_convert(tz_name)
+                .dt.tz_localize(None)
+                .to_numpy()
             )
         except Exception as e:
             print(f"⚠️  Timezone conversion failed for park {park_id} ({tz_name}): {e}")
 
+    df["local_timestamp"] = pd.Series(
+        local_values, index=df.index, dtype="datetime64[ns]"
+    )
+
     return df
 
 
@@ -85,35 +133,37 @@ def add_weekend_feature(df: pd.DataFrame, parks_metadata: pd.DataFrame) -> pd.Da
     # Middle East countries use Friday+Saturday as weekend
     middle_east_countries = ["SA", "AE", "BH", "KW", "OM", "QA", "IL"]
 
-    # Initialize is_weekend column
-    df["is_weekend"] = 0
+    # Map parkId -> country once; unknown parks fall back to the Western weekend
+    country_by_park = parks_metadata.drop_duplicates("park_id").set_index("park_id")[
+        "country"
+    ]
+    is_middle_east = (
+        df["parkId"].map(country_by_park).isin(middle_east_countries).to_numpy()
+    )
 
-    # For each park, determine weekend based on country
-    for park_id in df["parkId"].unique():
-        park_info = parks_metadata[parks_metadata["park_id"] == park_id]
-        park_mask = df["parkId"] == park_id
+    # dayofweek: 0=Monday, 1=Tuesday, 2=Wednesday, 3=Thursday, 4=Friday, 5=Saturday, 6=Sunday
+    day_of_week = df["day_of_week"].to_numpy()
+    df["is_weekend"] = np.where(
+        is_middle_east,
+        (day_of_week == 4) | (day_of_week == 5),  # Middle East: Friday + Saturday
+        (day_of_week == 5) | (day_of_week == 6),  # Western: Saturday + Sunday
+    ).astype(np.int8)
 
-        if not park_info.empty:
-            country = park_info.iloc[0]["country"]
+    return df
 
-            if country in middle_east_countries:
-                # Middle East: Friday (4) + Saturday (5)
-                # dayofweek: 0=Monday, 1=Tuesday, 2=Wednesday, 3=Thursday, 4=Friday, 5=Saturday, 6=Sunday
-                df.loc[park_mask, "is_weekend"] = (
-                    df.loc[park_mask, "day_of_week"].isin([4, 5]).astype(int)
-                )
-            else:
-                # Western: Saturday (5) + Sunday (6)
-                df.loc[park_mask, "is_weekend"] = (
-                    df.loc[park_mask, "day_of_week"].isin([5, 6]).astype(int)
-                )
-        else:
-            # Default: Western weekend (Saturday + Sunday)
-            df.loc[park_mask, "is_weekend"] = (
-                df.loc[park_mask, "day_of_week"].isin([5, 6]).astype(int)
-            )
 
-    return df
+def _cyclic_encoding(values: np.ndarray, period: float, n_values: int) -> tuple:
+    """
+    Sin/cos encoding of a small integer domain (hour, month, weekday, day of year)
+
+    The trig functions are evaluated once per possible value (0..n_values-1) and
+    gathered per row. float32 matches the precision CatBoost trains on.
+    """
+    angles = 2 * np.pi * np.arange(n_values) / period
+    return (
+        np.sin(angles).astype(np.float32)[values],
+        np.cos(angles).astype(np.float32)[values],
+    )
 
 
 def add_time_features(df: pd.DataFrame, parks_metadata: pd.DataFrame) -> pd.DataFrame:
@@ -124,46 +174,61 @@ def add_time_features(df: pd.DataFrame, parks_metadata: pd.DataFrame) -> pd.Data
     df = convert_to_local_time(df, parks_metadata)
 
     # 2. Extract features from LOCAL time
-    df["hour"] = df["local_timestamp"].dt.hour
-    df["month"] = df["local_timestamp"].dt.month
-    df["day_of_week"] = df["local_timestamp"].dt.dayofweek  # 0=Monday, 6=Sunday
+    # Built as plain arrays and attached in one concat instead of ~15 single
+    # column inserts (training frames already carry SQL hour/month/... columns,
+    # which are replaced)
+    local_ts = df["local_timestamp"].dt
+    hour = local_ts.hour.to_numpy().astype(np.int8)
+    month = local_ts.month.to_numpy().astype(np.int8)
+    day_of_week = local_ts.dayofweek.to_numpy().astype(np.int8)  # 0=Monday, 6=Sunday
+    day_of_year = local_ts.dayofyear.to_numpy().astype(np.int16)  # 1-365/366
 
     # Cyclic encoding (essential for tree models to understand continuity)
     # e.g., hour=23 and hour=0 are close, not 23 units apart
-    df["hour_sin"] = np.sin(2 * np.pi * df["hour"] / 24)
-    df["hour_cos"] = np.cos(2 * np.pi * df["hour"] / 24)
-    df["month_sin"] = np.sin(2 * np.pi * df["month"] / 12)
-    df["month_cos"] = np.cos(2 * np.pi * df["month"] / 12)
-    df["day_of_week_sin"] = np.sin(2 * np.pi * df["day_of_week"] / 7)
-    df["day_of_week_cos"] = np.cos(2 * np.pi * df["day_of_week"] / 7)
-
-    # Day of year (1-365/366) for finer seasonal trends
-    df["day_of_year"] = df["local_timestamp"].dt.dayofyear
-    df["day_of_year_sin"] = np.sin(2 * np.pi * df["day_of_year"] / 365.25)
-    df["day_of_year_cos"] = np.cos(2 * np.pi * df["day_of_year"] / 365.25)
-
-    # Season (derived from month)
-    def get_season(month):
-        if month in [12, 1, 2]:
-            return 0  # Winter
-        if month in [3, 4, 5]:
-            return 1  # Spring
-        if month in [6, 7, 8]:
-            return 2  # Summer
-        return 3  # Fall
-
-    df["season"] = df["month"].apply(get_season)
-
-    # Peak season indicator (summer months + December holidays)
-    # Peak seasons: June-August (summer), December (holidays)
-    df["is_peak_season"] = ((df["month"] >= 6) & (df["month"] <= 8)) | (
-        df["month"] == 12
+    hour_sin, hour_cos = _cyclic_encoding(hour, 24, 24)
+    month_sin, month_cos = _cyclic_encoding(month, 12, 13)
+    day_of_week_sin, day_of_week_cos = _cyclic_encoding(day_of_week, 7, 7)
+    # Day of year for finer seasonal trends
+    day_of_year_sin, day_of_year_cos = _cyclic_encoding(day_of_year, 365.25, 367)
+
+    # Season (derived from month): lookup indexed by month number (index 0 unused)
+    # 0=Winter (Dec-Feb), 1=Spring (Mar-May), 2=Summer (Jun-Aug), 3=Fall (Sep-Nov)
+    season_by_month = np.array([0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0], dtype=np.int8)
+
+    time_features = pd.DataFrame(
+        {
+            "hour": hour,
+            "month": month,
+            "day_of_week": day_of_week,
+            "hour_sin": hour_sin,
+            "hour_cos": hour_cos,
+            "month_sin": month_sin,
+            "month_cos": month_cos,
+            "day_of_week_sin": day_of_week_sin,
+            "day_of_week_cos": day_of_week_cos,
+            "day_of_year": day_of_year,
+            "day_of_year_sin": day_of_year_sin,
+            "day_of_year_cos": day_of_year_cos,
+            "season": season_by_month[month],
+            # Peak season indicator: June-August (summer), December (holidays)
+            "is_peak_season": (((month >= 6) & (month <= 8)) | (month == 12)).astype(
+                np.int8
+            ),
+            # 3. Use LOCAL date for further lookups (holidays, weather)
+            # This prevents using yesterday's weather for today's morning
+            # (due to UTC lag)
+            "date_local": local_ts.date,
+        },
+        index=df.index,
+    )
+    df = pd.concat(
+        [
+            df.drop(columns=time_features.columns.intersection(df.columns)),
+            time_features,
+        ],
+        axis=1,
+        copy=False,
     )
-    df["is_peak_season"] = df["is_peak_season"].astype(int)
-
-    # 3. Use LOCAL date for further lookups (holidays, weather)
-    # This prevents using yesterday's weather for today's morning (due to UTC lag)
-    df["date_local"] = df["local_timestamp"].dt.date
 
     # Region-specific weekend detection
     # Use centralized function to avoid code duplication
@@ -188,17 +253,28 @@ def add_weather_features(df: pd.DataFrame) -> pd.DataFrame:
     for col in numeric_weather_cols:
         if col in df.columns:
             # Fill with park-specific mean, then global mean
+            park_mean = df.groupby("parkId", observed=True)[col].transform("mean")
             df[col] = (
-                df.groupby("parkId")[col]
-                .transform(lambda x: x.fillna(x.mean()))
-                .fillna(df[col].mean())
+                df[col].fillna(park_mean).fillna(df[col].mean()).astype(np.float32)
             )
 
     # Fill weatherCode (categorical) with mode, then convert to int
     if "weatherCode" in df.columns:
-        # Fill with park-specific mode (most common value), then global mode
-        df["weatherCode"] = df.groupby("parkId")["weatherCode"].transform(
-            lambda x: x.fillna(x.mode()[0] if len(x.mode()) > 0 else 0)
+        # Fill with park-specific mode (most common value, smallest code on ties
+        # like Series.mode), then global mode. Parks without any code get 0.
+        code_counts = (
+            df.groupby(["parkId", "weatherCode"], observed=True)
+            .size()
+            .rename("count")
+            .reset_index()
+            .sort_values(["count", "weatherCode"], ascending=[False, True])
+        )
+        park_modes = code_counts.drop_duplicates("parkId").set_index("parkId")[
+            "weatherCode"
+        ]
+        park_mode = park_modes.reindex(df["parkId"].to_numpy(), fill_value=0)
+        df["weatherCode"] = df["weatherCode"].fillna(
+            pd.Series(park_mode.to_numpy(), index=df.index)
         )
         # Fill any remaining NaN with global mode
         if df["weatherCode"].isna().any():
@@ -207,7 +283,7 @@ def add_weather_features(df: pd.DataFrame) -> pd.DataFrame:
                 global_mode[0] if len(global_mode) > 0 else 0
             )
         # Convert to integer (CatBoost requires int/string for categorical features)
-        df["weatherCode"] = df["weatherCode"].astype(int)
+        df["weatherCode"] = df["weatherCode"].astype(np.int16)
 
     # Temperature average (Sinusoidal interpolation to match TypeScript WeatherService)
     # Min at 4am, Max at 2pm (14:00)
@@ -224,63 +300,64 @@ def add_weather_features(df: pd.DataFrame) -> pd.DataFrame:
             normalized_time = ((df["hour"] - 14) / 12) * np.pi
             interpolation_factor = np.cos(normalized_time) * -0.5 + 0.5
 
-            df["temperature_avg"] = temp_min + (interpolation_factor * temp_range)
+            df["temperature_avg"] = (
+                temp_min + (interpolation_factor * temp_range)
+            ).astype(np.float32)
         else:
             # Fallback to flat average
-            df["temperature_avg"] = (df["temperatureMax"] + df["temperatureMin"]) / 2
+            df["temperature_avg"] = (
+                (df["temperatureMax"] + df["temperatureMin"]) / 2
+            ).astype(np.float32)
 
     # Binary rain indicator (explicit signal, valuable for ML)
     if "precipitation" in df.columns:
-        df["is_raining"] = (df["precipitation"] > 0).astype(int)
-
-        # Rain Trend Features (is_rain_starting, is_rain_stopping)
-        # Behavioral signals: guests seek shelter when rain starts
-        if "timestamp" in df.columns:
-            original_index = df.index
-            df = df.sort_values(["parkId", "timestamp"])
-
-            # Use shift(1) to find the previous state
-            was_raining = df.groupby("parkId")["is_raining"].shift(1).fillna(0)
-            df["is_rain_starting"] = (
-                (df["is_raining"] == 1) & (was_raining == 0)
-            ).astype(int)
-            df["is_rain_stopping"] = (
-                (df["is_raining"] == 0) & (was_raining == 1)
-            ).astype(int)
-
-            df = df.loc[original_index]
+        df["is_raining"] = (df["precipitation"] > 0).astype(np.int8)
+
+        # Rain Trend Features (is_rain_starting, is_rain_stopping) and
+        # precipitation_last_3h share one stable (parkId, timestamp) ordering;
+        # results are scattered back by position, so df itself is never re-sorted.
+        # For inference, precipitation_last_3h is provided via feature_context.
+        if "timestamp" in df.columns and not df.empty:
+            park_codes = pd.factorize(df["parkId"])[0]
+            ts = df["timestamp"].values.astype("datetime64[ns]").view("int64")
+            order = np.lexsort((ts, park_codes))
+            starts, ends = _group_bounds(park_codes[order])
+
+            # Behavioral signals: guests seek shelter when rain starts.
+            # was_raining is the previous reading of the same park (0 for the first)
+            raining = df["is_raining"].to_numpy()[order]
+            was_raining = np.empty_like(raining)
+            was_raining[1:] = raining[:-1]
+            was_raining[starts] = 0
+            is_rain_starting = np.empty(len(df), dtype=np.int8)
+            is_rain_stopping = np.empty(len(df), dtype=np.int8)
+            is_rain_starting[order] = (raining == 1) & (was_raining == 0)
+            is_rain_stopping[order] = (raining == 0) & (was_raining == 1)
+            df["is_rain_starting"] = is_rain_starting
+            df["is_rain_stopping"] = is_rain_stopping
+
+            # Precipitation last 3 hours (cumulative effect): [t-3h, t) per park
+            sums, _, _ = _window_sums(
+                ts[order],
+                df["precipitation"].to_numpy(dtype=np.float64)[order],
+                (starts, ends),
+                pd.Timedelta("3h").value,
+            )
+            precipitation_last_3h = np.empty(len(df), dtype=np.float32)
+            precipitation_last_3h[order] = sums  # empty window sums to 0
+            df["precipitation_last_3h"] = precipitation_last_3h
         else:
             df["is_rain_starting"] = 0
             df["is_rain_stopping"] = 0
-
-        # Precipitation last 3 hours (cumulative effect)
-        # For training: use rolling window on historical data
-        # For inference: will be provided via feature_context
-        if "timestamp" in df.columns:
-            # Sort by (parkId, timestamp) so that groupby().rolling().values aligns
-            # correctly with df rows — groupby produces (parkId, timestamp) order.
-            original_index = df.index
-            df = df.sort_values(["parkId", "timestamp"])
-            df_sorted = df.set_index("timestamp")
-            df["precipitation_last_3h"] = (
-                df_sorted.groupby("parkId")["precipitation"]
-                .rolling("3h", closed="left", min_periods=1)
-                .sum()
-                .reset_index(level=0, drop=True)
-                .values
-            )
-            df = df.loc[original_index]  # restore original row order
-            df["precipitation_last_3h"] = df["precipitation_last_3h"].fillna(0)
-        else:
             df["precipitation_last_3h"] = 0
 
     # Temperature deviation (current vs. monthly average)
     # Helps model understand if weather is unusually hot/cold
     if "temperature_avg" in df.columns and "month" in df.columns:
         # Calculate monthly average temperature per park
-        monthly_avg = df.groupby(["parkId", "month"])["temperature_avg"].transform(
-            "mean"
-        )
+        monthly_avg = df.groupby(["parkId", "month"], observed=True)[
+            "temperature_avg"
+        ].transform("mean")
         df["temperature_deviation"] = df["temperature_avg"] - monthly_avg
         df["temperature_deviation"] = df["temperature_deviation"].fillna(0)
     else:
@@ -289,6 +366,25 @@ def add_weather_features(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def _holiday_countries(
+    parks_metadata: pd.DataFrame, include_influencing: bool = True
+) -> set:
+    """
+    Countries to fetch holidays for: every park's country and, optionally, the
+    countryCode of each influencingRegions entry
+    """
+    countries = set(parks_metadata["country"].dropna())
+    if include_influencing:
+        regions = parks_metadata["influencingRegions"]
+        entries = regions[regions.map(lambda r: isinstance(r, list))].explode()
+        countries.update(
+            entry["countryCode"]
+            for entry in entries
+            if isinstance(entry, dict) and "countryCode" in entry
+        )
+    return countries
+
+
 def add_holiday_features(
     df: pd.DataFrame,
     parks_metadata: pd.DataFrame,
@@ -327,18 +423,10 @@ def add_holiday_features(
 
     # Use cached holidays if provided, otherwise fetch
     if cached_holidays_df is not None:
-        holidays_df = cached_holidays_df.copy()
+        holidays_df = cached_holidays_df
     else:
-        # Get unique countries to fetch holidays for
-        all_countries = set()
-        for _, row in parks_metadata.iterrows():
-            all_countries.add(row["country"])
-
-            # Add countries from influencingRegions JSON
-            if isinstance(row["influencingRegions"], list):
-                for region in row["influencingRegions"]:
-                    if isinstance(region, dict) and "countryCode" in region:
-                        all_countries.add(region["countryCode"])
+        # Get unique countries to fetch holidays for (incl. influencing regions)
+        all_countries = _holiday_countries(parks_metadata)
 
         # Fetch all holidays
         holidays_df = fetch_holidays(list(all_countries), start_date, end_date)
@@ -346,14 +434,18 @@ def add_holiday_features(
     # Convert date column to date type (handle both datetime and date types)
     if not holidays_df.empty:
         # Convert to datetime first (handles both date and datetime), then extract date
-        holidays_df["date"] = pd.to_datetime(holidays_df["date"]).dt.date
+        dates = pd.to_datetime(holidays_df["date"]).dt.date
 
         # Filter to date range (cached may include extra days for bridge day calculations)
         if cached_holidays_df is not None:
-            holidays_df = holidays_df[
-                (holidays_df["date"] >= start_date.date())
-                & (holidays_df["date"] <= end_date.date())
-            ]
+            in_range = (dates >= start_date.date()) & (dates <= end_date.date())
+            holidays_df, dates = holidays_df[in_range], dates[in_range]
+
+        # Keep only the columns used below; the cached frame is shared with the
+        # bridge/distance steps and is never modified here
+        holidays_df = holidays_df[
+            ["country", "region", "holiday_type", "is_nationwide"]
+        ].assign(date=dates)
 
     # Weekend extensions are now handled by the TypeScript API (enrichScheduleWithHolidays)
     # The API correctly extends ONLY school holidays to weekends, not public holidays
@@ -363,8 +455,8 @@ def add_holiday_features(
     # Create holiday lookup DataFrames for vectorized merge
     # Regional holidays: (country, region, date) -> holiday_type
     # National holidays: (country, date) -> holiday_type
-    regional_holidays = holidays_df[holidays_df["region"].notna()].copy()
-    national_holidays = holidays_df[holidays_df["is_nationwide"]].copy()
+    regional_holidays = holidays_df[holidays_df["region"].notna()]
+    national_holidays = holidays_df[holidays_df["is_nationwide"]]
 
     # Ensure date_local exists in df
     if "date_local" not in df.columns:
@@ -378,18 +470,22 @@ def add_holiday_features(
     # 1. Primary Location Holiday Check (vectorized)
     if not regional_holidays.empty:
         # Normalize region codes in both DataFrames for consistent matching
-        regional_holidays = regional_holidays.copy()
-        regional_holidays["region_normalized"] = regional_holidays["region"].apply(
-            normalize_region_code
+        # One call per distinct code rather than per row
+        region_normalized = regional_holidays["region"].map(
+            {
+                code: normalize_region_code(code)
+                for code in regional_holidays["region"].unique()
+            }
+        )
+        df["region_code_normalized"] = df["region_code"].map(
+            {code: normalize_region_code(code) for code in df["region_code"].unique()}
         )
-        df["region_code_normalized"] = df["region_code"].apply(normalize_region_code)
 
         # Merge regional holidays using normalized region codes
-        regional_holidays["date_only"] = regional_holidays["date"]
         df_regional = df.merge(
-            regional_holidays[
-                ["country", "region_normalized", "date_only", "holiday_type"]
-            ],
+            regional_holidays[["country", "date", "holiday_type"]]
+            .rename(columns={"date": "date_only"})
+            .assign(region_normalized=region_normalized),
             left_on=["country", "region_code_normalized", "date_local"],
             right_on=["country", "region_normalized", "date_only"],
             how="left",
@@ -403,9 +499,10 @@ def add_holiday_features(
 
     if not national_holidays.empty:
         # Merge national holidays
-        national_holidays["date_only"] = national_holidays["date"]
         df_national = df.merge(
-            national_holidays[["country", "date_only", "holiday_type"]],
+            national_holidays[["country", "date", "holiday_type"]].rename(
+                columns={"date": "date_only"}
+            ),
             left_on=["country", "date_local"],
             right_on=["country", "date_only"],
             how="left",
@@ -424,10 +521,10 @@ def add_holiday_features(
     # Weekend extensions are already included in holidays_df from above
     # We include 'bridge' and 'bank' as holidays as they typically correlate with high traffic
     df["is_holiday_primary"] = (
-        df["primary_holiday_type"].isin(["public", "bank", "bridge"]).astype(int)
+        df["primary_holiday_type"].isin(["public", "bank", "bridge"]).astype(np.int8)
     )
     df["is_school_holiday_primary"] = (df["primary_holiday_type"] == "school").astype(
-        int
+        np.int8
     )
 
     # Easter Sunday fallback: Nager.Date only returns Easter Sunday as a public holiday
@@ -465,111 +562,143 @@ def add_holiday_features(
         )
         df.loc[easter_mask, "is_holiday_primary"] = 1
 
-    # 2. Influencing Regions Check (still needs some iteration due to JSON structure)
-    # Create lookup maps for faster access
-    # Import region normalization utility
-
-    holiday_map_regional = {}
-    holiday_map_national = {}
-    # Country-wide "any region" sets: a country-level (null-region) influencing entry — e.g.
-    # Belgium, whose school breaks are REGIONAL (BE-DE/FR/NL), not nationwide — matches if ANY
-    # region of that country has the holiday that day. The national map alone misses it.
-    country_any_school = set()
-    country_any_public = set()
-
-    if not holidays_df.empty:
-        for _, row in holidays_df.iterrows():
-            h_date = row["date"]
-            h_country = row["country"]
-            h_type = row["holiday_type"]
-            h_region = row["region"]
-            is_nationwide = row["is_nationwide"]
-
-            if is_nationwide:
-                holiday_map_national[(h_country, h_date)] = h_type
-            if h_region:
-                # Normalize region code for consistent matching (handles both "DE-NW" and "NW")
-                normalized_region = normalize_region_code(h_region)
-                holiday_map_regional[(h_country, normalized_region, h_date)] = h_type
-            if h_type == "school":
-                country_any_school.add((h_country, h_date))
-            elif h_type in ("public", "bank", "bridge"):
-                country_any_public.add((h_country, h_date))
-
-    def check_neighbor_holidays(row):
-        """Aggregate holiday signals across ALL influencing regions. Fixes the old
-        raw_regions[:3] cap that silently dropped border parks' most important neighbours —
-        e.g. Phantasialand's NL-LI/NL-GE/BE sat in slots 4-6, so the Dutch/Belgian summer
-        break never counted. A country-level (null-region) entry — e.g. Belgium, whose school
-        breaks are REGIONAL not nationwide — falls back to a country-wide 'any region' check.
-        Returns (public_count, school_count, first-3 public flags for the legacy per-slot cols)."""
-        date = row["date_local"]
-        raw_regions = row["influencingRegions"]
-        if pd.isna(date) or not isinstance(raw_regions, list) or not raw_regions:
-            return 0, 0, [0, 0, 0]
-
-        public_count = 0
-        school_count = 0
-        slot_flags = [0, 0, 0]
-        seen = set()  # dedupe overlapping influencing regions
-        for i, region_def in enumerate(raw_regions):
-            if not isinstance(region_def, dict):
-                continue
-            n_country = region_def.get("countryCode")
-            n_region = region_def.get("regionCode")
-            norm = normalize_region_code(n_region) if n_region else None
-            key = (n_country, norm)
-            if key in seen:
-                continue
-            seen.add(key)
-            if norm:
-                n_type = holiday_map_regional.get(
-                    (n_country, norm, date)
-                ) or holiday_map_national.get((n_country, date))
-                is_school = int(n_type == "school")
-                is_public = int(n_type in ("public", "bank", "bridge"))
-            else:
-                # country-wide (null region): ANY region of the country on holiday that day
-                is_school = int((n_country, date) in country_any_school)
-                is_public = int((n_country, date) in country_any_public)
-            school_count += is_school
-            public_count += is_public
-            if i < 3:
-                slot_flags[i] = is_public
-        return public_count, school_count, slot_flags
-
-    # Apply neighbor check (aggregate over ALL influencing regions, not just the first 3).
+    # 2. Influencing Regions Check (vectorized explode + merge)
+    # Aggregates holiday signals across ALL influencing regions. Fixes the old
+    # raw_regions[:3] cap that silently dropped border parks' most important
+    # neighbours — e.g. Phantasialand's NL-LI/NL-GE/BE sat in slots 4-6, so the
+    # Dutch/Belgian summer break never counted. A country-level (null-region)
+    # entry — e.g. Belgium, whose school breaks are REGIONAL not nationwide —
+    # falls back to a country-wide "any region" check.
     #
-    # Evaluated once per unique (parkId, date_local) pair rather than once per
-    # row: the result depends on nothing else, because `influencingRegions` is
-    # a property of the park. A training frame has millions of rows but only a
-    # few thousand distinct park-days, so the row-wise apply repeated the exact
-    # same dict lookups thousands of times per park-day.
+    # Evaluated once per unique (parkId, date_local) pair and mapped back onto
+    # the rows: the result depends on nothing else, because
+    # `influencingRegions` is a property of the park.
     # See test_neighbor_holiday_features.py for the invariant this relies on.
-    _pair_cols = ["parkId", "date_local", "influencingRegions"]
-    _pairs = df[_pair_cols].drop_duplicates(subset=["parkId", "date_local"])
+    public_types = ["public", "bank", "bridge"]
+
+    # One row per (park, influencing region); `slot` is the position in the
+    # park's list and drives the legacy per-slot columns
+    neighbors = (
+        parks_metadata[["park_id", "influencingRegions"]]
+        .drop_duplicates(subset=["park_id"])
+        .rename(columns={"park_id": "parkId"})
+    )
+    neighbors = neighbors[
+        neighbors["influencingRegions"].map(lambda r: isinstance(r, list))
+    ].explode("influencingRegions")
+    neighbors["slot"] = neighbors.groupby("parkId", sort=False).cumcount()
+    neighbors = neighbors[
+        neighbors["influencingRegions"].map(lambda r: isinstance(r, dict))
+    ]
+    neighbors["n_country"] = neighbors["influencingRegions"].map(
+        lambda r: r.get("countryCode")
+    )
+    neighbors["n_region"] = neighbors["influencingRegions"].map(
+        lambda r: normalize_region_code(r.get("regionCode"))
+    )
+    # Dedupe overlapping influencing regions (e.g. "LI" and "NL-LI")
+    neighbors = neighbors.drop_duplicates(subset=["parkId", "n_country", "n_region"])
 
-    if _pairs.empty:
-        neighbor_results = pd.Series([], index=df.index, dtype=object)
+    pairs = df[["parkId", "date_local"]].drop_duplicates()
+    pairs = pairs[pairs["date_local"].notna()]
+    expanded = pairs.merge(
+        neighbors[["parkId", "slot", "n_country", "n_region"]], on="parkId"
+    )
+
+    if expanded.empty or holidays_df.empty:
+        expanded["is_public"] = 0
+        expanded["is_school"] = 0
     else:
-        _pair_results = _pairs.apply(check_neighbor_holidays, axis=1)
-        _lookup = dict(
-            zip(zip(_pairs["parkId"], _pairs["date_local"]), _pair_results)
+        # Lookup tables keyed like the former dicts (later rows win on collisions)
+        holiday_keys = holidays_df[
+            ["country", "region", "date", "holiday_type", "is_nationwide"]
+        ].rename(columns={"country": "n_country", "date": "date_local"})
+        has_region = holiday_keys["region"].notna() & (holiday_keys["region"] != "")
+        regional_lookup = holiday_keys[has_region].assign(
+            n_region=lambda h: h["region"].map(normalize_region_code),
+            regional_type=lambda h: h["holiday_type"],
+        )
+        regional_lookup = regional_lookup.drop_duplicates(
+            subset=["n_country", "n_region", "date_local"], keep="last"
         )
-        neighbor_results = pd.Series(
-            [
-                _lookup[key]
-                for key in zip(df["parkId"], df["date_local"])
-            ],
-            index=df.index,
-            dtype=object,
+        national_lookup = (
+            holiday_keys[holiday_keys["is_nationwide"].astype(bool)]
+            .rename(columns={"holiday_type": "national_type"})
+            .drop_duplicates(subset=["n_country", "date_local"], keep="last")
+        )
+        # Country-wide "any region" flags: a country-level (null-region)
+        # influencing entry matches if ANY region of that country has the
+        # holiday that day. The national lookup alone misses it.
+        country_any = (
+            holiday_keys.assign(
+                any_school=holiday_keys["holiday_type"] == "school",
+                any_public=holiday_keys["holiday_type"].isin(public_types),
+            )
+            .groupby(["n_country", "date_local"], sort=False)[
+                ["any_school", "any_public"]
+            ]
+            .any()
+            .reset_index()
         )
-    df["_neighbor_public_count"] = neighbor_results.apply(lambda x: x[0])
-    df["neighbor_school_holiday_count"] = neighbor_results.apply(lambda x: x[1])
-    _slot = neighbor_results.apply(lambda x: x[2])
-    df["is_holiday_neighbor_1"] = _slot.apply(lambda x: x[0])
-    df["is_holiday_neighbor_2"] = _slot.apply(lambda x: x[1])
-    df["is_holiday_neighbor_3"] = _slot.apply(lambda x: x[2])
+
+        expanded = (
+            expanded.merge(
+                regional_lookup[
+                    ["n_country", "n_region", "date_local", "regional_type"]
+                ],
+                on=["n_country", "n_region", "date_local"],
+                how="left",
+            )
+            .merge(
+                national_lookup[["n_country", "date_local", "national_type"]],
+                on=["n_country", "date_local"],
+                how="left",
+            )
+            .merge(country_any, on=["n_country", "date_local"], how="left")
+        )
+
+        # Regional match first, national fallback
+        has_regional = expanded["regional_type"].notna() & (
+            expanded["regional_type"] != ""
+        )
+        n_type = expanded["regional_type"].where(
+            has_regional, expanded["national_type"]
+        )
+        has_norm = expanded["n_region"].notna() & (expanded["n_region"] != "")
+        expanded["is_public"] = np.where(
+            has_norm,
+            n_type.isin(public_types),
+            expanded["any_public"].eq(True),
+        ).astype(int)
+        expanded["is_school"] = np.where(
+            has_norm,
+            n_type == "school",
+            expanded["any_school"].eq(True),
+        ).astype(int)
+
+    for slot in range(3):
+        expanded[f"slot_{slot}"] = expanded["is_public"].where(
+            expanded["slot"] == slot, 0
+        )
+    neighbor_totals = (
+        expanded.groupby(["parkId", "date_local"], observed=True, sort=False)[
+            ["is_public", "is_school", "slot_0", "slot_1", "slot_2"]
+        ]
+        .sum()
+        .reset_index()
+    )
+    neighbor_results = (
+        df[["parkId", "date_local"]]
+        .merge(neighbor_totals, on=["parkId", "date_local"], how="left")
+        .fillna({col: 0 for col in neighbor_totals.columns[2:]})
+    )
+    df["_neighbor_public_count"] = neighbor_results["is_public"].astype(int).to_numpy()
+    df["neighbor_school_holiday_count"] = (
+        neighbor_results["is_school"].astype(int).to_numpy()
+    )
+    df["is_holiday_neighbor_1"] = neighbor_results["slot_0"].to_numpy(dtype=np.int8)
+    df["is_holiday_neighbor_2"] = neighbor_results["slot_1"].to_numpy(dtype=np.int8)
+    df["is_holiday_neighbor_3"] = neighbor_results["slot_2"].to_numpy(dtype=np.int8)
 
     # Totals — now the FULL influencing-region aggregate, not just the first 3 slots.
     df["holiday_count_total"] = (
@@ -581,7 +710,7 @@ def add_holiday_features(
     df["is_school_holiday_any"] = (
         (df["is_school_holiday_primary"] == 1)
         | (df["neighbor_school_holiday_count"] > 0)
-    ).astype(int)
+    ).astype(np.int8)
 
     # Clean up temporary columns
     df = df.drop(
@@ -601,6 +730,124 @@ def add_holiday_features(
     return df
 
 
+def _group_bounds(keys: pd.Series) -> tuple:
+    """
+    (starts, ends) row offsets of each run of equal keys in an already grouped column
+    """
+    codes = pd.factorize(keys)[0]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(codes)]
+    return starts, ends
+
+
+def _window_sums(
+    ts: np.ndarray, values: np.ndarray, bounds: tuple, window: int
+) -> tuple:
+    """
+    Per-row sum, sum of squares and count of non-NaN values in [ts - window, ts)
+    within each group
+
+    Rows must be sorted by group, then timestamp (int64 nanoseconds). Runs the
+    compiled Numba two-pointer kernel (parallel over groups) when numba is
+    installed, otherwise prefix sums with a searchsorted per group.
+    """
+    starts, ends = bounds
+    if NUMBA_AVAILABLE:
+        from window_kernels import window_sums
+
+        return window_sums(ts, values, starts, ends, window)
+
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    sum_prefix = np.r_[0.0, np.cumsum(filled)]
+    square_prefix = np.r_[0.0, np.cumsum(filled * filled)]
+    count_prefix = np.r_[0, np.cumsum(valid)]
+    left = np.empty(len(ts), dtype=np.int64)
+    right = np.empty(len(ts), dtype=np.int64)
+    for start, end in zip(starts, ends):
+        segment = ts[start:end]
+        left[start:end] = start + np.searchsorted(segment, segment - window)
+        right[start:end] = start + np.searchsorted(segment, segment)
+    return (
+        sum_prefix[right] - sum_prefix[left],
+        square_prefix[right] - square_prefix[left],
+        count_prefix[right] - count_prefix[left],
+    )
+
+
+def _rolling_mean(
+    ts: np.ndarray,
+    values: np.ndarray,
+    bounds: tuple,
+    window: str,
+    fill: float = np.nan,
+) -> np.ndarray:
+    """Time-windowed float32 mean over [ts - window, ts); `fill` if it is empty"""
+    sums, _, counts = _window_sums(ts, values, bounds, pd.Timedelta(window).value)
+    return np.divide(
+        sums, counts, out=np.full(len(sums), fill), where=counts > 0
+    ).astype(np.float32)
+
+
+def _rolling_std(
+    ts: np.ndarray,
+    values: np.ndarray,
+    bounds: tuple,
+    window: str,
+    fill: float = np.nan,
+) -> np.ndarray:
+    """Time-windowed float32 sample std over [ts - window, ts); `fill` below 2 values"""
+    sums, squares, counts = _window_sums(
+        ts, values, bounds, pd.Timedelta(window).value
+    )
+    enough = counts > 1
+    n = np.where(enough, counts, 2)
+    variance = (squares - sums * sums / n) / (n - 1)
+    # Rounding can push a constant window slightly below zero
+    return np.where(enough, np.sqrt(np.maximum(variance, 0.0)), fill).astype(
+        np.float32
+    )
+
+
+def _wait_time_velocity(
+    attraction_ids: pd.Series, wait: np.ndarray, window: int = 6
+) -> np.ndarray:
+    """
+    Mean of the previous `window` wait time changes per attraction, 0 where undefined
+
+    Same as groupby(attractionId).transform(lambda x: x.diff().rolling(window,
+    min_periods=1).mean().shift(1)).fillna(0), in the frame's current row order,
+    computed with prefix sums over all attractions at once.
+    """
+    codes = pd.factorize(attraction_ids)[0]
+    order = np.argsort(codes, kind="stable")
+    grouped = codes[order]
+    values = wait[order]
+    n = len(values)
+
+    positions = np.arange(n)
+    is_start = np.r_[True, grouped[1:] != grouped[:-1]] if n else np.zeros(0, bool)
+    group_start = np.maximum.accumulate(np.where(is_start, positions, 0))
+
+    diff = np.r_[np.nan, np.diff(values)] if n else np.zeros(0)
+    diff[is_start] = np.nan
+    valid = ~np.isnan(diff)
+    sum_prefix = np.r_[0.0, np.cumsum(np.where(valid, diff, 0.0))]
+    count_prefix = np.r_[0, np.cumsum(valid)]
+    low = np.maximum(positions - window + 1, group_start)
+    sums = sum_prefix[positions + 1] - sum_prefix[low]
+    counts = count_prefix[positions + 1] - count_prefix[low]
+    means = np.divide(sums, counts, out=np.zeros(n), where=counts > 0)
+
+    # shift(1) within each attraction; the first row has no history
+    shifted = np.r_[0.0, means[:-1]] if n else means
+    shifted[is_start] = 0.0
+    velocity = np.empty(n)
+    velocity[order] = shifted
+    velocity[codes < 0] = 0.0  # rows without an attraction id
+    return velocity
+
+
 def add_historical_features(df: pd.DataFrame) -> pd.DataFrame:
     """
     Add historical wait time features
@@ -616,94 +863,69 @@ def add_historical_features(df: pd.DataFrame) -> pd.DataFrame:
     if "timestamp" not in df.columns:
         return df
 
-    # Sort by (attractionId, timestamp) so that groupby().rolling().values assignments
-    # align correctly — groupby produces results in (attractionId, timestamp) order,
-    # so df must be in the same order for positional .values assignment.
-    # merge_asof calls below re-sort internally and use pandas index alignment, so they
-    # are unaffected by this order change.
+    # Sort by (attractionId, timestamp): the windowed features below walk each
+    # attraction's rows in time order and are assigned positionally.
+    # The lag lookups sort by timestamp on their own and scatter back by position,
+    # so they are unaffected by this order change.
     original_index = df.index
     df = df.sort_values(["attractionId", "timestamp"])
 
     # 1. Time-based Rolling Features
-    # Must use index for time-based rolling
-    df_indexed = df.set_index("timestamp").sort_index()
+    # Windows are [t - window, t): excluding the current timestamp prevents data
+    # leakage (same as rolling(window, closed="left", min_periods=1).mean()).
+    # All windows share the sort above and one set of attraction boundaries.
+    # Empty windows are written as 0 directly (the final fill value) except for
+    # avg_wait_last_1h, which stays NaN for the lag fallback below.
+    ts = df["timestamp"].values.astype("datetime64[ns]").view("int64")
+    wait = df["waitTime"].to_numpy(dtype=float)
+    bounds = _group_bounds(df["attractionId"])
 
     # avg_wait_last_1h: [t-1h, t)
-    # closed='left' excludes current timestamp, preventing data leakage
-    df["avg_wait_last_1h"] = (
-        df_indexed.groupby("attractionId")["waitTime"]
-        .rolling("1h", closed="left", min_periods=1)
-        .mean()
-        .reset_index(level=0, drop=True)
-        .values
-    )
+    df["avg_wait_last_1h"] = _rolling_mean(ts, wait, bounds, "1h")
 
     # avg_wait_last_24h: [t-24h, t)
-    df["avg_wait_last_24h"] = (
-        df_indexed.groupby("attractionId")["waitTime"]
-        .rolling("24h", closed="left", min_periods=1)
-        .mean()
-        .reset_index(level=0, drop=True)
-        .values
-    )
+    df["avg_wait_last_24h"] = _rolling_mean(ts, wait, bounds, "24h", fill=0.0)
 
     # rolling_avg_7d: [t-7d, t)
-    df["rolling_avg_7d"] = (
-        df_indexed.groupby("attractionId")["waitTime"]
-        .rolling("7d", closed="left", min_periods=1)
-        .mean()
-        .reset_index(level=0, drop=True)
-        .values
-    )
+    df["rolling_avg_7d"] = _rolling_mean(ts, wait, bounds, "7d", fill=0.0)
 
     # rolling_avg_weekday / rolling_avg_weekend: 7-day rolling mean split by day type.
     # Helps the model distinguish a ride's typical weekday vs weekend load.
-    _df_indexed_dow = df_indexed.copy()
-    _df_indexed_dow["_wait_weekday"] = _df_indexed_dow["waitTime"].where(
-        _df_indexed_dow.index.dayofweek < 5  # Mon-Fri
-    )
-    _df_indexed_dow["_wait_weekend"] = _df_indexed_dow["waitTime"].where(
-        _df_indexed_dow.index.dayofweek >= 5  # Sat-Sun
+    day_of_week = df["timestamp"].dt.dayofweek.to_numpy()
+    wait_weekday = np.where(day_of_week < 5, wait, np.nan)  # Mon-Fri
+    wait_weekend = np.where(day_of_week >= 5, wait, np.nan)  # Sat-Sun
+    df["rolling_avg_weekday"] = _rolling_mean(
+        ts, wait_weekday, bounds, "7d", fill=0.0
     )
-    df["rolling_avg_weekday"] = (
-        _df_indexed_dow.groupby("attractionId")["_wait_weekday"]
-        .rolling("7d", closed="left", min_periods=1)
-        .mean()
-        .reset_index(level=0, drop=True)
-        .values
+    df["rolling_avg_weekend"] = _rolling_mean(
+        ts, wait_weekend, bounds, "7d", fill=0.0
     )
-    df["rolling_avg_weekend"] = (
-        _df_indexed_dow.groupby("attractionId")["_wait_weekend"]
-        .rolling("7d", closed="left", min_periods=1)
-        .mean()
-        .reset_index(level=0, drop=True)
-        .values
-    )
-    del _df_indexed_dow
 
     # rolling_avg_28d / rolling_avg_90d: longer-window baselines for seasonal smoothing.
     # Used as dropout fallback for avg_wait_last_1h (90d) and rolling_avg_7d (28d) during training,
     # and as standalone features at inference for multi-week predictions.
-    df["rolling_avg_28d"] = (
-        df_indexed.groupby("attractionId")["waitTime"]
-        .rolling("28d", closed="left", min_periods=1)
-        .mean()
-        .reset_index(level=0, drop=True)
-        .values
-    )
-    df["rolling_avg_90d"] = (
-        df_indexed.groupby("attractionId")["waitTime"]
-        .rolling("90d", closed="left", min_periods=1)
-        .mean()
-        .reset_index(level=0, drop=True)
-        .values
-    )
+    df["rolling_avg_28d"] = _rolling_mean(ts, wait, bounds, "28d", fill=0.0)
+    df["rolling_avg_90d"] = _rolling_mean(ts, wait, bounds, "90d", fill=0.0)
+
+    # volatility_7d / _weekday / _weekend: sample std over the same 7-day windows
+    # (at least 2 observations, 0 otherwise). The log dampening is applied after
+    # the trend features.
+    df["volatility_7d"] = _rolling_std(ts, wait, bounds, "7d", fill=0.0)
+    df["volatility_weekday"] = _rolling_std(ts, wait_weekday, bounds, "7d", fill=0.0)
+    df["volatility_weekend"] = _rolling_std(ts, wait_weekend, bounds, "7d", fill=0.0)
 
     df = df.loc[original_index]
 
     # 2. Lag Features (Exact time lookups: T-24h, T-1w, etc.)
-    # Optimized: Prepare lookup once and calculate all lags in a single pass
-    lookup = df[["attractionId", "timestamp", "waitTime"]].sort_values("timestamp")
+    # Optimized: Sort once by timestamp and share the lookup across all lags.
+    # Shifting every timestamp by the same delta keeps that order, so each lag's
+    # targets are already sorted for merge_asof (no per-lag copy or re-sort).
+    order = np.argsort(df["timestamp"].values, kind="stable")
+    lookup = (
+        df[["attractionId", "timestamp", "waitTime"]]
+        .iloc[order]
+        .reset_index(drop=True)
+    )
 
     lags = {
         "wait_lag_24h": pd.Timedelta(hours=24),
@@ -715,26 +937,27 @@ def add_historical_features(df: pd.DataFrame) -> pd.DataFrame:
     }
 
     for col_name, delta in lags.items():
-        temp = df[["attractionId", "timestamp"]].copy()
-        temp["target_ts"] = temp["timestamp"] - delta
-        temp = temp.sort_values("target_ts")
-
-        # IMPORTANT: do NOT use .values here.
-        # temp is sorted by target_ts (different row order from df).
-        # merge_asof returns a DataFrame with temp's index (df's labels, target_ts-sorted).
-        # Without .values, pandas uses index alignment when assigning back to df,
-        # placing each merged value at the correct df row regardless of sort order.
-        # Using .values would strip the index and cause positional misalignment.
-        df[col_name] = pd.merge_asof(
-            temp,
+        targets = pd.DataFrame(
+            {
+                "attractionId": lookup["attractionId"],
+                "target_ts": lookup["timestamp"] - delta,
+            }
+        )
+        matched = pd.merge_asof(
+            targets,
             lookup,
             left_on="target_ts",
             right_on="timestamp",
             by="attractionId",
             tolerance=pd.Timedelta("15min"),
             direction="nearest",
-            suffixes=("", "_lag"),
-        )["waitTime"]
+        )["waitTime"].to_numpy(dtype=float)
+
+        # merge_asof keeps the left (timestamp-sorted) row order; scatter the
+        # matches back to df's row positions
+        lag_values = np.empty(len(df), dtype=np.float32)
+        lag_values[order] = matched
+        df[col_name] = lag_values
 
     # avg_wait_same_dow_4w: mean of last 4 same-day-of-week observations.
     # More stable than a single 1-week lag; gives a representative "normal" for this hour+dow.
@@ -756,24 +979,15 @@ def add_historical_features(df: pd.DataFrame) -> pd.DataFrame:
     df["avg_wait_last_1h"] = df["avg_wait_last_1h"].fillna(df["wait_lag_1w"])
 
     # Final Fills with Global Means
+    # (the rolling means and volatilities are already 0-filled by their helpers)
     hist_cols = [
-        "avg_wait_last_24h",
         "avg_wait_last_1h",
         "avg_wait_same_hour_last_week",
         "avg_wait_same_hour_last_month",
-        "rolling_avg_7d",
-        "rolling_avg_weekday",
-        "rolling_avg_weekend",
-        "rolling_avg_28d",
-        "rolling_avg_90d",
         "wait_lag_2w",
         "wait_lag_3w",
         "wait_lag_4w",
         "avg_wait_same_dow_4w",
-        "trend_7d",
-        "volatility_7d",
-        "volatility_weekday",
-        "volatility_weekend",
     ]
     for col in hist_cols:
         if col in df.columns:
@@ -783,10 +997,8 @@ def add_historical_features(df: pd.DataFrame) -> pd.DataFrame:
     # Logic: Change over last 30 mins
     # (Current - Avg 30 mins ago) ?
     # For simplicity, we keep the Diff-based logic but ensure it is robust
-    df["wait_time_velocity"] = (
-        df.groupby("attractionId")["waitTime"]
-        .transform(lambda x: x.diff().rolling(window=6, min_periods=1).mean().shift(1))
-        .fillna(0)
+    df["wait_time_velocity"] = _wait_time_velocity(
+        df["attractionId"], df["waitTime"].to_numpy(dtype=float)
     )
 
     # Calculate dampening log constants
@@ -798,73 +1010,14 @@ def add_historical_features(df: pd.DataFrame) -> pd.DataFrame:
     # Instead, we will define trend as the difference between the 24h rolling average
     # and the 7d rolling average:
     if "avg_wait_last_24h" in df.columns and "rolling_avg_7d" in df.columns:
-        df["trend_7d"] = (df["avg_wait_last_24h"] - df["rolling_avg_7d"]).fillna(0.0)
+        df["trend_7d"] = df["avg_wait_last_24h"] - df["rolling_avg_7d"]
     else:
         df["trend_7d"] = 0.0
 
-    # Need time-based grouped rolling
-    # Because there are duplicate timestamps across attractions, using timestamp as the
-    # sole index will crash alignment. To assign back safely without a multi-index, we rely
-    # on `.values` mapping, which requires the DataFrame and the GroupBy output to be
-    # strictly ordered by `["attractionId", "timestamp"]`.
-    #
-    # df was restored to original_index order after the rolling section (line ~661).
-    # Re-sort here so that .values assignment from groupby+rolling aligns with df rows.
-    # (Mirrors the sort at the start of section 1.)
-    df = df.sort_values(["attractionId", "timestamp"])
-
-    # We must set index to timestamp for .rolling("7d") to work.
-    # Do NOT call sort_index() or sort_values() on df_indexed — after set_index the
-    # "timestamp" column no longer exists as a column, so sort_values(["attractionId",
-    # "timestamp"]) would raise a KeyError.  Keeping df_indexed in [attractionId,
-    # timestamp] order (inherited from the sort above) is sufficient: within each
-    # attractionId group the timestamps are already monotonically increasing, satisfying
-    # the requirement for time-based rolling windows.
-    df_indexed = df.set_index("timestamp")
-
-    # Calculate rolling std for last 7d
-    # sort=True (default) ensures groupby returns groups in attractionId-sorted order,
-    # so .values aligns with df which is also sorted by ["attractionId", "timestamp"].
-    df["volatility_7d"] = (
-        df_indexed.groupby("attractionId", sort=True)["waitTime"]
-        .rolling("7d", closed="left", min_periods=2)
-        .std()
-        .values
-    )
-
-    # Recreate weekday vs weekend masks
-    _df_indexed_dow = df_indexed.copy()
-    _df_indexed_dow["_wait_weekday"] = _df_indexed_dow["waitTime"].where(
-        _df_indexed_dow.index.dayofweek < 5  # Mon-Fri
-    )
-    _df_indexed_dow["_wait_weekend"] = _df_indexed_dow["waitTime"].where(
-        _df_indexed_dow.index.dayofweek >= 5  # Sat-Sun
-    )
-
-    # Rolling std for weekday only
-    df["volatility_weekday"] = (
-        _df_indexed_dow.groupby("attractionId", sort=True)["_wait_weekday"]
-        .rolling("7d", closed="left", min_periods=2)
-        .std()
-        .values
-    )
-
-    # Rolling std for weekend only
-    df["volatility_weekend"] = (
-        _df_indexed_dow.groupby("attractionId", sort=True)["_wait_weekend"]
-        .rolling("7d", closed="left", min_periods=2)
-        .std()
-        .values
-    )
-
     # Clean up and apply log limits
     for col in ["volatility_7d", "volatility_weekday", "volatility_weekend"]:
-        df[col] = df[col].fillna(0.0)
         df[col] = np.minimum(np.log1p(df[col]), max_log_vol)
 
-    # Restore the original sort order using the variable from line 559
-    df = df.loc[original_index]
-
     return df
 
 
@@ -912,6 +1065,38 @@ def add_interaction_features(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def _historical_occupancy(
+    park_ids: pd.Series, ts_naive: pd.Series, hist_occ: Dict
+) -> pd.Series:
+    """
+    Per-row occupancy from the {park_id: {(pg_dow, hour): pct}} historical lookup
+
+    Unknown (dow, hour) slots of a park with history default to 100.0; rows of
+    parks without history are NaN so the caller keeps its current value.
+    """
+    lookup = pd.Series(
+        {
+            (park_id, dow, hour): pct
+            for park_id, park_hist in hist_occ.items()
+            for (dow, hour), pct in park_hist.items()
+        },
+        dtype=float,
+    )
+    if lookup.empty:
+        return pd.Series(np.nan, index=park_ids.index)
+
+    # Postgres DOW (0=Sun) from the UTC timestamp:
+    # pandas dayofweek: Mon=0 … Sun=6 → Postgres DOW: Sun=0, Mon=1 … Sat=6
+    park_keys = park_ids.astype(str)
+    pg_dow = (ts_naive.dt.dayofweek.to_numpy() + 1) % 7
+    hour = ts_naive.dt.hour.to_numpy()
+    hist_vals = lookup.reindex(
+        pd.MultiIndex.from_arrays([park_keys, pg_dow, hour]), fill_value=100.0
+    ).to_numpy()
+    has_history = park_keys.isin([park_id for park_id, h in hist_occ.items() if h])
+    return pd.Series(np.where(has_history, hist_vals, np.nan), index=park_ids.index)
+
+
 def add_park_occupancy_feature(
     df: pd.DataFrame, feature_context: Dict = None
 ) -> pd.DataFrame:
@@ -941,6 +1126,19 @@ def add_park_occupancy_feature(
         hist_occ = feature_context.get("historicalOccupancy", {})
         base_time = feature_context.get("baseTime")
 
+        # Real-time occupancy per row (NaN for parks without a current value)
+        realtime_pct = (
+            df["parkId"]
+            .map(
+                {
+                    park_id: float(occupancy_pct)
+                    for park_id, occupancy_pct in park_occupancy_map.items()
+                    if occupancy_pct is not None
+                }
+            )
+            .astype(float)
+        )
+
         if base_time is not None:
             # Normalise base_time to a timezone-naive UTC timestamp for comparison
             if hasattr(base_time, "tzinfo") and base_time.tzinfo is not None:
@@ -960,40 +1158,18 @@ def add_park_occupancy_feature(
             near_term_mask = (ts_naive - base_time_naive).abs() <= pd.Timedelta(hours=2)
 
             # Apply real-time occupancy for near-term rows (within 2 hours of base_time)
-            for park_id, occupancy_pct in park_occupancy_map.items():
-                if occupancy_pct is None:
-                    continue
-                park_mask = df["parkId"] == park_id
-                df.loc[park_mask & near_term_mask, "park_occupancy_pct"] = float(
-                    occupancy_pct
-                )
+            realtime_mask = near_term_mask & realtime_pct.notna()
+            df.loc[realtime_mask, "park_occupancy_pct"] = realtime_pct[realtime_mask]
 
             # Apply historical (DOW, hour) lookup for future rows (> 2 hours from base_time)
             future_mask = ~near_term_mask
             if future_mask.any() and hist_occ:
-                for park_id in df["parkId"].unique():
-                    park_hist = hist_occ.get(str(park_id), {})
-                    if not park_hist:
-                        continue
-                    park_future_mask = (df["parkId"] == park_id) & future_mask
-                    if not park_future_mask.any():
-                        continue
-                    # Compute Postgres DOW (0=Sun) from UTC timestamp
-                    # pandas dayofweek: Mon=0 … Sun=6 → Postgres DOW: Sun=0, Mon=1 … Sat=6
-                    pandas_dow = ts_naive[park_future_mask].dt.dayofweek
-                    pg_dow = ((pandas_dow + 1) % 7).astype(int)
-                    hour = ts_naive[park_future_mask].dt.hour.astype(int)
-                    hist_vals = [
-                        park_hist.get((d, h), 100.0) for d, h in zip(pg_dow, hour)
-                    ]
-                    df.loc[park_future_mask, "park_occupancy_pct"] = hist_vals
+                hist_pct = _historical_occupancy(df["parkId"], ts_naive, hist_occ)
+                hist_mask = future_mask & hist_pct.notna()
+                df.loc[hist_mask, "park_occupancy_pct"] = hist_pct[hist_mask]
         else:
             # No base_time — fall back to applying real-time value to ALL rows
-            for park_id, occupancy_pct in park_occupancy_map.items():
-                if occupancy_pct is None:
-                    continue
-                mask = df["parkId"] == park_id
-                df.loc[mask, "park_occupancy_pct"] = float(occupancy_pct)
+            df["park_occupancy_pct"] = realtime_pct.fillna(100.0)
 
     elif feature_context and "historicalOccupancy" in feature_context:
         # No real-time occupancy (e.g. daily predictions 2 weeks out): use historical lookup for ALL rows
@@ -1005,16 +1181,9 @@ def add_park_occupancy_feature(
             else:
                 ts_naive = ts
 
-            for park_id in df["parkId"].unique():
-                park_hist = hist_occ.get(str(park_id), {})
-                if not park_hist:
-                    continue
-                park_mask = df["parkId"] == park_id
-                pandas_dow = ts_naive[park_mask].dt.dayofweek
-                pg_dow = ((pandas_dow + 1) % 7).astype(int)
-                hour = ts_naive[park_mask].dt.hour.astype(int)
-                hist_vals = [park_hist.get((d, h), 100.0) for d, h in zip(pg_dow, hour)]
-                df.loc[park_mask, "park_occupancy_pct"] = hist_vals
+            hist_pct = _historical_occupancy(df["parkId"], ts_naive, hist_occ)
+            has_history = hist_pct.notna()
+            df.loc[has_history, "park_occupancy_pct"] = hist_pct[has_history]
 
     else:
         # Training Mode: Reconstruct historical occupancy to match inference scale
@@ -1033,36 +1202,40 @@ def add_park_occupancy_feature(
                 # For attractions without stored baseline, fallback to window-median
                 missing_mask = df["p50_baseline"].isna()
                 if missing_mask.any():
-                    window_medians = df.groupby("attractionId")["waitTime"].transform(
-                        "median"
-                    )
+                    window_medians = df.groupby("attractionId", observed=True)[
+                        "waitTime"
+                    ].transform("median")
                     df.loc[missing_mask, "p50_baseline"] = window_medians[missing_mask]
 
                 # Calculate park baseline as average of its attractions' P50s
-                per_ride_p50 = df.groupby(["parkId", "attractionId"])[
+                per_ride_p50 = df.groupby(["parkId", "attractionId"], observed=True)[
                     "p50_baseline"
                 ].first()
-                park_baselines = per_ride_p50.groupby(level="parkId").mean()
+                park_baselines = per_ride_p50.groupby(
+                    level="parkId", observed=True
+                ).mean()
             else:
                 # Fallback if table is empty
-                per_ride_p50 = df.groupby(["parkId", "attractionId"])[
+                per_ride_p50 = df.groupby(["parkId", "attractionId"], observed=True)[
                     "waitTime"
                 ].quantile(0.50)
-                park_baselines = per_ride_p50.groupby(level="parkId").mean()
+                park_baselines = per_ride_p50.groupby(
+                    level="parkId", observed=True
+                ).mean()
         except Exception as e:
             print(
                 f"⚠️  Failed to fetch stored baselines, falling back to window medians: {e}"
             )
-            per_ride_p50 = df.groupby(["parkId", "attractionId"])["waitTime"].quantile(
-                0.50
-            )
-            park_baselines = per_ride_p50.groupby(level="parkId").mean()
+            per_ride_p50 = df.groupby(["parkId", "attractionId"], observed=True)[
+                "waitTime"
+            ].quantile(0.50)
+            park_baselines = per_ride_p50.groupby(level="parkId", observed=True).mean()
 
         # 2. Calculate Instantaneous Park Average (per timestamp)
         # Group by Park + Timestamp to get the average wait at that moment
-        current_park_avg = df.groupby(["parkId", "timestamp"])["waitTime"].transform(
-            "mean"
-        )
+        current_park_avg = df.groupby(["parkId", "timestamp"], observed=True)[
+            "waitTime"
+        ].transform("mean")
 
         # 3. Calculate Percentage
         # We process per park to divide by the correct baseline
@@ -1090,6 +1263,17 @@ def add_park_occupancy_feature(
     return df
 
 
+@lru_cache(maxsize=4096)
+def _parse_opening_time(opening_time_str: str) -> pd.Timestamp:
+    """
+    Parse an opening time (ISO string with offset) to a UTC Timestamp
+
+    Cached because parks share opening times and the same strings come back with
+    every prediction request of the day.
+    """
+    return pd.Timestamp(opening_time_str).tz_convert("UTC")
+
+
 def add_time_since_park_open(
     df: pd.DataFrame, feature_context: Dict = None
 ) -> pd.DataFrame:
@@ -1111,31 +1295,27 @@ def add_time_since_park_open(
         df["time_since_park_open_mins"] = 0.0  # reset only when context is provided
         opening_times_map = feature_context["parkOpeningTimes"]
 
+        # Parse each park's opening time once, as a UTC instant
+        opening_times = {}
         for park_id, opening_time_str in opening_times_map.items():
             if not opening_time_str:
                 continue
 
             try:
-                # Parse opening time
-                opening_time = pd.to_datetime(opening_time_str)
-
-                # Calculate minutes since opening for this park
-                mask = df["parkId"] == park_id
-                if mask.any():
-                    # Use local_timestamp if available, otherwise timestamp
-                    time_col = (
-                        "local_timestamp"
-                        if "local_timestamp" in df.columns
-                        else "timestamp"
-                    )
-
-                    df.loc[mask, "time_since_park_open_mins"] = (
-                        (df.loc[mask, time_col] - opening_time).dt.total_seconds() / 60
-                    ).clip(lower=0)  # Negative = park not yet open, clip to 0
-
+                opening_times[park_id] = _parse_opening_time(opening_time_str)
             except Exception as e:
                 print(f"⚠️  Failed to parse opening time for park {park_id}: {e}")
 
+        if opening_times:
+            # Compare instants: timestamp is tz-aware UTC, while local_timestamp
+            # is naive local wall time. Parks without an opening time stay 0.
+            opening_time = df["parkId"].map(opening_times)
+            df["time_since_park_open_mins"] = (
+                ((df["timestamp"] - opening_time).dt.total_seconds() / 60)
+                .clip(lower=0)  # Negative = park not yet open, clip to 0
+                .fillna(0.0)
+            )
+
     return df
 
 
@@ -1164,11 +1344,20 @@ def add_downtime_features(
     if feature_context and "downtimeCache" in feature_context:
         downtime_map = feature_context["downtimeCache"]
 
-        for attraction_id, downtime_mins in downtime_map.items():
-            mask = df["attractionId"] == str(attraction_id)
-            if mask.any() and downtime_mins > 0:
-                df.loc[mask, "had_downtime_today"] = 1
-                df.loc[mask, "downtime_minutes_today"] = float(downtime_mins)
+        # Minutes down today per attraction (NaN for attractions without downtime)
+        downtime_mins = (
+            df["attractionId"]
+            .map(
+                {
+                    str(attraction_id): float(mins)
+                    for attraction_id, mins in downtime_map.items()
+                    if mins > 0
+                }
+            )
+            .astype(float)
+        )
+        df["had_downtime_today"] = downtime_mins.notna().astype(int)
+        df["downtime_minutes_today"] = downtime_mins.fillna(0.0)
     elif "downtime_count" in df.columns:
         # Training Mode: Reconstruct downtime from SQL signals
         # Sort to ensure cumsum is chronological
@@ -1179,10 +1368,14 @@ def add_downtime_features(
         # Convert downtime_count to minutes (approx 5 min per raw sample)
         df["_mins_down"] = df["downtime_count"] * 5.0
 
-        # Group by attraction and date to get cumulative downtime for "today"
-        df["downtime_minutes_today"] = df.groupby(["attractionId", "date_local"])[
-            "_mins_down"
-        ].transform(lambda x: x.cumsum().shift(1).fillna(0))
+        # Group by attraction and date to get cumulative downtime for "today",
+        # excluding the current sample (cumsum().shift(1) with 0 for the first)
+        df["downtime_minutes_today"] = (
+            df.groupby(["attractionId", "date_local"], observed=True)[
+                "_mins_down"
+            ].cumsum()
+            - df["_mins_down"]
+        )
 
         # Binary flag: was it down at any point earlier today?
         df["had_downtime_today"] = (df["downtime_minutes_today"] > 0).astype(int)
@@ -1350,11 +1543,13 @@ def add_virtual_queue_feature(
     if feature_context and "queueData" in feature_context:
         queue_data_map = feature_context["queueData"]
 
-        for attraction_id, queue_info in queue_data_map.items():
-            # Check if this attraction has BOARDING_GROUP queue type
-            if queue_info and queue_info.get("queueType") == "BOARDING_GROUP":
-                mask = df["attractionId"] == str(attraction_id)
-                df.loc[mask, "has_virtual_queue"] = 1
+        # Attractions with a BOARDING_GROUP queue type
+        boarding_groups = {
+            str(attraction_id)
+            for attraction_id, queue_info in queue_data_map.items()
+            if queue_info and queue_info.get("queueType") == "BOARDING_GROUP"
+        }
+        df["has_virtual_queue"] = df["attractionId"].isin(boarding_groups).astype(int)
 
     return df
 
@@ -1456,79 +1651,56 @@ def add_park_schedule_features(
                 suffixes=("", "_schedule"),
             )
 
-            # Vectorized time comparisons
+            # Vectorized time comparisons (opening/closing times are tz-aware,
+            # so compare against the UTC timestamp rather than local wall time)
             mask_valid = (
                 df_merged["opening_time"].notna() & df_merged["closing_time"].notna()
             )
             mask_open = (
                 mask_valid
-                & (df_merged["local_timestamp"] >= df_merged["opening_time"])
-                & (df_merged["local_timestamp"] <= df_merged["closing_time"])
+                & (df_merged["timestamp"] >= df_merged["opening_time"])
+                & (df_merged["timestamp"] <= df_merged["closing_time"])
             )
 
             df["is_park_open"] = mask_open.astype(int).values
 
             # Calculate time since open (vectorized)
             time_since_open = (
-                df_merged["local_timestamp"] - df_merged["opening_time"]
+                df_merged["timestamp"] - df_merged["opening_time"]
             ).dt.total_seconds() / 60.0
             df["time_since_park_open_mins"] = (
                 time_since_open.where(mask_valid, 0.0).clip(lower=0).values
             )
 
+        # Special events / extra hours: membership of each row's
+        # (parkId, schedule date) in the matching schedule days
+        schedule_dates = (
+            df["schedule_date"] if "schedule_date" in df.columns else df["date_local"]
+        )
+        row_keys = pd.MultiIndex.from_arrays([df["parkId"], schedule_dates])
+
         # Check for special events (fully vectorized)
         event_schedules = park_schedules[
             park_schedules["schedule_type"].isin(["TICKETED_EVENT", "PRIVATE_EVENT"])
-        ].copy()
+        ]
         if not event_schedules.empty:
-            event_schedules["date_only"] = event_schedules["date"].dt.date
-            # Create lookup set for fast membership testing
-            event_lookup = set(
-                zip(event_schedules["park_id"], event_schedules["date_only"])
-            )
-            # Vectorized check using merge
-            event_df = pd.DataFrame(
-                list(event_lookup), columns=["park_id", "date_only"]
-            )
-            event_df["has_event"] = 1
-            # Ensure schedule_date exists for merge
-            if "schedule_date" not in df.columns:
-                df["schedule_date"] = df["date_local"]
-            df_events = df.merge(
-                event_df,
-                left_on=["parkId", "schedule_date"],
-                right_on=["park_id", "date_only"],
-                how="left",
+            event_keys = pd.MultiIndex.from_arrays(
+                [event_schedules["park_id"], event_schedules["date"].dt.date]
             )
-            df["has_special_event"] = df_events["has_event"].fillna(0).astype(int)
+            df["has_special_event"] = row_keys.isin(event_keys).astype(int)
 
         # Check for extra hours (fully vectorized)
         extra_hours_schedules = park_schedules[
             park_schedules["schedule_type"] == "EXTRA_HOURS"
-        ].copy()
+        ]
         if not extra_hours_schedules.empty:
-            extra_hours_schedules["date_only"] = extra_hours_schedules["date"].dt.date
-            # Create lookup set for fast membership testing
-            extra_hours_lookup = set(
-                zip(
-                    extra_hours_schedules["park_id"], extra_hours_schedules["date_only"]
-                )
-            )
-            # Vectorized check using merge
-            extra_hours_df = pd.DataFrame(
-                list(extra_hours_lookup), columns=["park_id", "date_only"]
-            )
-            extra_hours_df["has_extra"] = 1
-            # Ensure schedule_date exists for merge
-            if "schedule_date" not in df.columns:
-                df["schedule_date"] = df["date_local"]
-            df_extra = df.merge(
-                extra_hours_df,
-                left_on=["parkId", "schedule_date"],
-                right_on=["park_id", "date_only"],
-                how="left",
+            extra_hours_keys = pd.MultiIndex.from_arrays(
+                [
+                    extra_hours_schedules["park_id"],
+                    extra_hours_schedules["date"].dt.date,
+                ]
             )
-            df["has_extra_hours"] = df_extra["has_extra"].fillna(0).astype(int)
+            df["has_extra_hours"] = row_keys.isin(extra_hours_keys).astype(int)
 
     # Clean up temporary columns (after all merges are done)
     df = df.drop(columns=["schedule_date"], errors="ignore")
@@ -1546,12 +1718,14 @@ def add_park_schedule_features(
     if feature_context and "currentWaitTimes" in feature_context:
         cw = feature_context["currentWaitTimes"]
         if "attractionId" in df.columns:
-            mask_context = (
-                (df["is_park_open"] == 0)
-                & df["attractionId"].isin(cw.keys())
-                & df["attractionId"].apply(
-                    lambda x: cw.get(x, 0) >= 10 if x in cw else False
-                )
+            # Attractions currently reporting a real queue
+            open_ids = [
+                attraction_id
+                for attraction_id, wait_time in cw.items()
+                if wait_time is not None and wait_time >= 10
+            ]
+            mask_context = (df["is_park_open"] == 0) & df["attractionId"].isin(
+                open_ids
             )
             df.loc[mask_context, "is_park_open"] = 1
 
@@ -1580,7 +1754,8 @@ def resample_data(df: pd.DataFrame) -> pd.DataFrame:
     - Use mean for wait times (represents hourly average)
     - Forward fill up to 2 hours for minor gaps
 
-    Processes groups in chunks to bound peak memory usage.
+    All (attractionId, parkId) groups are resampled in a single
+    groupby().resample() call.
     """
     if df.empty:
         return df
@@ -1590,63 +1765,28 @@ def resample_data(df: pd.DataFrame) -> pd.DataFrame:
 
     print(f"   Rows before resampling: {len(df):,}")
 
-    # Process in chunks of 100 attractions to avoid holding all groups in memory at once
-    CHUNK_SIZE = 100
-    resampled_chunks = []
-
-    groups = list(df.groupby(["attractionId", "parkId"]))
-    total_groups = len(groups)
-
-    # Process in chunks
-    for chunk_idx in range(0, total_groups, CHUNK_SIZE):
-        chunk_groups = groups[chunk_idx : chunk_idx + CHUNK_SIZE]
-        chunk_parts = []
-
-        for (attraction_id, park_id), group in chunk_groups:
-            # Set sorted timestamp index
-            group = group.set_index("timestamp").sort_index()
-
-            # Identify columns to aggregate
-            numeric_cols = group.select_dtypes(include=np.number).columns.tolist()
-            # Exclude 'waitTime' from the 'first' aggregation if it's in numeric_cols
-            # as it will be handled by 'mean'
-            if "waitTime" in numeric_cols:
-                numeric_cols.remove("waitTime")
-
-            non_numeric_cols = group.select_dtypes(exclude=np.number).columns.tolist()
-
-            # Define aggregation dictionary
-            agg_dict = {"waitTime": "mean"}
-            for col in numeric_cols:
-                agg_dict[col] = (
-                    "first"  # Take the first value for other numeric columns
-                )
-            for col in non_numeric_cols:
-                agg_dict[col] = "first"  # Take the first value for non-numeric columns
-
-            # Resample to 30-minute intervals (sweet spot for hourly predictions)
-            # Mean: Average wait time within 30 mins
-            # Forward fill: Handle gaps up to 2 hours (4 * 30min = 2h)
-            resampled = group.resample("30min").agg(agg_dict).ffill(limit=4)
-
-            # Restore identifiers
-            resampled["attractionId"] = attraction_id
-            resampled["parkId"] = park_id
-            resampled = resampled.reset_index()
-
-            chunk_parts.append(resampled)
-
-        # Concat this chunk and add to final list
-        if chunk_parts:
-            chunk_df = pd.concat(chunk_parts, ignore_index=True)
-            resampled_chunks.append(chunk_df)
-            del chunk_parts  # Explicit cleanup to free memory
-
-    if not resampled_chunks:
-        return pd.DataFrame()
-
-    # Final concat of chunks (much smaller memory footprint)
-    df_resampled = pd.concat(resampled_chunks, ignore_index=True)
+    group_keys = ["attractionId", "parkId"]
+    value_cols = df.columns.difference(group_keys + ["timestamp"], sort=False)
+
+    # Define aggregation dictionary: mean wait time, first value for every other
+    # (numeric or non-numeric) column
+    agg_dict = {"waitTime": "mean"}
+    for col in value_cols:
+        if col != "waitTime":
+            agg_dict[col] = "first"
+
+    # Resample to 30-minute intervals (sweet spot for hourly predictions)
+    # Mean: Average wait time within 30 mins
+    # Forward fill: Handle gaps up to 2 hours (4 * 30min = 2h), within each group
+    resampled = (
+        df.set_index("timestamp")
+        .sort_index(kind="stable")
+        .groupby(group_keys, observed=True)
+        .resample("30min")
+        .agg(agg_dict)
+    )
+    resampled = resampled.groupby(level=group_keys, observed=True).ffill(limit=4)
+    df_resampled = resampled.reset_index()
 
     # Drop rows that weren't filled (original NaNs or beyond limit)
     df_resampled = df_resampled.dropna(subset=["waitTime", "parkId"])
@@ -1690,30 +1830,31 @@ def add_bridge_day_feature(
     # 2. Compare with historical holidays (Training)
     # Use cached holidays if provided, otherwise fetch
     if cached_holidays_df is not None:
-        holidays_df = cached_holidays_df.copy()
+        holidays_df = cached_holidays_df
     else:
         # Be robust: Fetch holidays 5 days before/after range to cover boundary conditions
         search_start = start_date - timedelta(days=5)
         search_end = end_date + timedelta(days=5)
 
         # Get relevant countries
-        all_countries = set()
-        for _, row in parks_metadata.iterrows():
-            all_countries.add(row["country"])
+        all_countries = _holiday_countries(parks_metadata, include_influencing=False)
 
         holidays_df = fetch_holidays(list(all_countries), search_start, search_end)
 
     if holidays_df.empty:
         return df
 
-    holidays_df["date"] = pd.to_datetime(holidays_df["date"]).dt.date
-
     # Lookup: {(country, date): type}
-    holiday_lookup = {}
-    for _, row in holidays_df.iterrows():
-        # Only care about public holidays for bridge days
-        if row["holiday_type"] == "public":
-            holiday_lookup[(row["country"], row["date"])] = True
+    # Only care about public holidays for bridge days. Dates are converted for
+    # those rows only; the (possibly cached, shared) frame is not modified.
+    is_public = (holidays_df["holiday_type"] == "public").to_numpy()
+    holiday_lookup = dict.fromkeys(
+        zip(
+            holidays_df["country"].to_numpy()[is_public],
+            pd.to_datetime(holidays_df["date"].to_numpy()[is_public]).date,
+        ),
+        True,
+    )
 
     # Vectorized approach: Pre-compute bridge dates per country using holiday_utils
     # Create country mapping for df
@@ -1727,47 +1868,48 @@ def add_bridge_day_feature(
         )
         df["country"] = df_country["country"]
 
-    # Pre-compute bridge dates per country using holiday_utils
-    # Build holiday map per country for utility function
-    bridge_dates = set()
-    for country in set(c for c, _ in holiday_lookup.keys()):
-        # Build holiday map for this country (date string -> holiday type)
-        # Use "public" to indicate public holidays for bridge day logic
-        country_holiday_map = {}
-        for (c, holiday_date), _ in holiday_lookup.items():
-            if c == country:
-                # Store as "public" type so bridge day logic works correctly
-                country_holiday_map[holiday_date.strftime("%Y-%m-%d")] = "public"
-
-        # Check all dates in the extended range for bridge days
-        # Use extended range to catch bridge days at boundaries
-        check_start = start_date - timedelta(days=5)
-        check_end = end_date + timedelta(days=5)
-        current_date = check_start.date()
-        while current_date <= check_end.date():
-            date_obj = datetime.combine(current_date, time.min)
-            is_holiday, holiday_name, is_bridge_day = calculate_holiday_info(
-                date_obj, country_holiday_map
-            )
-            if is_bridge_day:
-                bridge_dates.add((country, current_date))
-            current_date += timedelta(days=1)
-
-    # Create bridge lookup DataFrame
-    if bridge_dates:
-        bridge_df = pd.DataFrame(list(bridge_dates), columns=["country", "bridge_date"])
-        bridge_df["is_bridge"] = 1
-
-        # Merge with df to find bridge days
-        df_bridge = df.merge(
-            bridge_df,
-            left_on=["country", "date_local"],
-            right_on=["country", "bridge_date"],
-            how="left",
-        )
-        df["is_bridge_day"] = df_bridge["is_bridge"].fillna(0).astype(int)
-    else:
-        df["is_bridge_day"] = 0
+    # Bridge dates per country, with the rules of holiday_utils.calculate_holiday_info
+    # applied to all public holidays at once by shifting their dates:
+    # - Friday after a Thursday holiday, Thursday before a Friday holiday
+    # - Monday before a Tuesday holiday
+    # - Tuesday / Wednesday between two holidays
+    # A holiday itself is never a bridge day.
+    public = pd.DataFrame(list(holiday_lookup), columns=["country", "date"])
+    public["date"] = pd.to_datetime(public["date"])
+    public_keys = pd.MultiIndex.from_frame(public)
+    dow = public["date"].dt.dayofweek
+    one_day = pd.Timedelta(days=1)
+
+    between = public[dow.isin([0, 1])].assign(date=lambda h: h["date"] + one_day)
+    between = between[
+        pd.MultiIndex.from_arrays(
+            [between["country"], between["date"] + one_day]
+        ).isin(public_keys)
+    ]
+    candidates = pd.concat(
+        [
+            public[dow == 3].assign(date=lambda h: h["date"] + one_day),
+            public[dow.isin([1, 4])].assign(date=lambda h: h["date"] - one_day),
+            between,
+        ],
+        ignore_index=True,
+    )
+
+    # Extended range to catch bridge days at boundaries
+    check_start = pd.Timestamp((start_date - timedelta(days=5)).date())
+    check_end = pd.Timestamp((end_date + timedelta(days=5)).date())
+    candidates = candidates[
+        ~pd.MultiIndex.from_frame(candidates).isin(public_keys)
+        & candidates["date"].between(check_start, check_end)
+    ]
+    bridge_keys = pd.MultiIndex.from_arrays(
+        [candidates["country"], candidates["date"].dt.date]
+    )
+    df["is_bridge_day"] = (
+        pd.MultiIndex.from_arrays([df["country"], df["date_local"]])
+        .isin(bridge_keys)
+        .astype(int)
+    )
 
     # Clean up temporary country column if we added it
     if "country" not in df.columns or "park_id" in df.columns:
@@ -1969,6 +2111,13 @@ def engineer_features(
 
     total_start = time_module.time()
 
+    # Dictionary-encode the id columns once (already done by fetch_training_data
+    # and validate_training_data): every groupby/merge/isin below then hashes
+    # integer codes instead of per-row Python strings
+    for col in ("attractionId", "parkId"):
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+
     # 0. Resample to fix delta-compression gaps
     # DISABLED: SQL query (db.py fetch_training_data) now returns HOURLY aggregated data
     # Resampling to 30-min buckets would INCREASE rows (hourly → 30min = 2x explosion!)
@@ -1982,34 +2131,11 @@ def engineer_features(
     # df = resample_data(df)  # SKIP: Already aggregated by SQL
     print("   Resampling: SKIPPED (data already hourly-aggregated by SQL)")
 
-    # Fetch park metadata (needed for region-specific weekends & holidays)
-    metadata_start = time_module.time()
-    parks_metadata = fetch_parks_metadata()
-    print(f"   Parks metadata fetch time: {time_module.time() - metadata_start:.2f}s")
-
     # Cache DB queries to avoid duplicate fetches
     # fetch_holidays() is called in add_holiday_features() and add_bridge_day_feature()
     # fetch_park_schedules() is called in add_park_schedule_features() and add_park_has_schedule_feature()
     cache_start = time_module.time()
 
-    # Get all countries for holiday fetch (need to do this before fetching)
-    all_countries = set()
-    for _, row in parks_metadata.iterrows():
-        all_countries.add(row["country"])
-        # Add countries from influencingRegions JSON
-        if isinstance(row["influencingRegions"], list):
-            for region in row["influencingRegions"]:
-                if isinstance(region, dict) and "countryCode" in region:
-                    all_countries.add(region["countryCode"])
-
-    # Fetch holidays once (used by add_holiday_features and add_bridge_day_feature)
-    # Extend range by 5 days for bridge day calculations
-    holidays_search_start = start_date - timedelta(days=5)
-    holidays_search_end = end_date + timedelta(days=5)
-    cached_holidays_df = fetch_holidays(
-        list(all_countries), holidays_search_start, holidays_search_end
-    )
-
     # Fetch schedules once (used by add_park_schedule_features and add_park_has_schedule_feature)
     # Determine date range from local timestamps if available
     if "local_timestamp" in df.columns and not df["local_timestamp"].isna().all():
@@ -2019,10 +2145,41 @@ def engineer_features(
         start_date_local = start_date.date()
         end_date_local = end_date.date()
 
-    cached_schedules_df = fetch_park_schedules(
-        datetime.combine(start_date_local, time.min),
-        datetime.combine(end_date_local, time.max),
-    )
+    # Independent round-trips run concurrently, each on its own pooled
+    # connection (via get_db). Only the holiday fetch has to wait for the
+    # parks metadata (it needs the country list), so the schedule fetch is
+    # started first and overlaps both.
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        schedules_future = pool.submit(
+            fetch_park_schedules,
+            datetime.combine(start_date_local, time.min),
+            datetime.combine(end_date_local, time.max),
+        )
+
+        # Fetch park metadata (needed for region-specific weekends & holidays)
+        metadata_start = time_module.time()
+        parks_metadata = fetch_parks_metadata()
+        print(
+            f"   Parks metadata fetch time: {time_module.time() - metadata_start:.2f}s"
+        )
+
+        # Get all countries for holiday fetch (need to do this before fetching)
+        all_countries = _holiday_countries(parks_metadata)
+
+        # Fetch holidays once (used by add_holiday_features and add_bridge_day_feature)
+        # Extend range by 5 days for bridge day calculations
+        holidays_search_start = start_date - timedelta(days=5)
+        holidays_search_end = end_date + timedelta(days=5)
+        holidays_future = pool.submit(
+            fetch_holidays,
+            list(all_countries),
+            holidays_search_start,
+            holidays_search_end,
+        )
+        cached_holidays_df = holidays_future.result()
+        cached_schedules_df = schedules_future.result()
 
     print(f"   DB cache fetch time: {time_module.time() - cache_start:.2f}s")
 
@@ -2085,6 +2242,11 @@ def engineer_features(
     df = add_interaction_features(df)
     print(f"   Interaction features: {time_module.time() - interaction_start:.2f}s")
 
+    # Narrow the remaining int64/float64 feature columns in one pass
+    df = df.astype(
+        {col: dtype for col, dtype in FEATURE_DTYPES.items() if col in df.columns}
+    )
+
     total_time = time_module.time() - total_start
 
     # Performance summary - show slowest features (absolute times)
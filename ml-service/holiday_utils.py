@@ -12,9 +12,11 @@ Rules:
 """
 
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, Optional, Tuple
 
 
+@lru_cache(maxsize=512)
 def normalize_region_code(code: Optional[str]) -> Optional[str]:
     """
     Normalizes a region code by extracting the region part (after last "-").
@@ -36,6 +38,9 @@ def normalize_region_code(code: Optional[str]) -> Optional[str]:
         normalize_region_code("NW")  # "NW"
         normalize_region_code("US-FL")  # "FL"
         normalize_region_code(None)  # None
+
+    Memoized: there are only a few hundred distinct region codes, while the
+    feature pipelines normalize them per holiday row and per park.
     """
     if not code:
         return None
@@ -0,0 +1,127 @@
+"""
+Numba-compiled kernels for training data validation
+
+Numba is optional: when it is not installed NUMBA_AVAILABLE is False and
+callers fall back to the NumPy implementation in data_validation.py.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def _interpolated_quantile(part: np.ndarray, q: float) -> float:
+        """Linear-interpolated quantile of a partitioned buffer (pandas default)"""
+        pos = (len(part) - 1) * q
+        lo = int(np.floor(pos))
+        hi = int(np.ceil(pos))
+        return part[lo] + (part[hi] - part[lo]) * (pos - lo)
+
+    @njit(parallel=True, cache=True)
+    def iqr_mask(
+        order: np.ndarray,
+        wait: np.ndarray,
+        group_starts: np.ndarray,
+        group_sizes: np.ndarray,
+        min_samples: int,
+        hard_floor: float,
+    ) -> np.ndarray:
+        """
+        Flag rows above their attraction's Q3 + 3*IQR and above hard_floor
+
+        Args:
+            order: Row positions grouped by attraction (stable argsort of codes)
+            wait: waitTime per row (original row order)
+            group_starts: Offset of each attraction's segment in `order`
+            group_sizes: Number of rows per attraction (NaN waits included)
+            min_samples: Attractions with fewer rows are never flagged
+            hard_floor: Rows at or below this wait are never flagged
+
+        Returns:
+            Boolean mask in original row order
+        """
+        out = np.zeros(len(wait), dtype=np.bool_)
+        for g in prange(len(group_starts)):
+            n = group_sizes[g]
+            if n < min_samples:
+                continue
+            start = group_starts[g]
+
+            # NaN waits count towards min_samples (like groupby().size())
+            # but are skipped for the quartiles (like groupby().quantile())
+            buf = np.empty(n, dtype=np.float64)
+            m = 0
+            for j in range(n):
+                w = wait[order[start + j]]
+                if not np.isnan(w):
+                    buf[m] = w
+                    m += 1
+            if m == 0:
+                continue
+
+            # Only the four ranks around Q1/Q3 have to land in place, so a
+            # partition is enough (O(n) instead of a full sort)
+            kth = np.array(
+                [
+                    int(np.floor((m - 1) * 0.25)),
+                    int(np.ceil((m - 1) * 0.25)),
+                    int(np.floor((m - 1) * 0.75)),
+                    int(np.ceil((m - 1) * 0.75)),
+                ]
+            )
+            part = np.partition(buf[:m], kth)
+            q1 = _interpolated_quantile(part, 0.25)
+            q3 = _interpolated_quantile(part, 0.75)
+            upper = q3 + 3 * (q3 - q1)
+
+            for j in range(n):
+                row = order[start + j]
+                if wait[row] > upper and wait[row] > hard_floor:
+                    out[row] = True
+        return out
+
+    @njit(parallel=True, cache=True)
+    def combine_outlier_masks(
+        wait: np.ndarray, statistical: np.ndarray, max_wait: float
+    ) -> tuple:
+        """
+        Merge the negative / > max_wait / statistical checks in one pass
+
+        Args:
+            wait: waitTime per row
+            statistical: Boolean IQR outlier mask (see iqr_mask)
+            max_wait: Rows above this wait are flagged as extreme
+
+        Returns:
+            Tuple of (outlier mask, negative count, extreme-high count,
+            statistical count, outlier count)
+        """
+        n = len(wait)
+        out = np.empty(n, dtype=np.bool_)
+        negative = 0
+        extreme_high = 0
+        stat = 0
+        total = 0
+        for i in prange(n):
+            w = wait[i]
+            is_negative = w < 0
+            is_high = w > max_wait
+            flagged = is_negative or is_high or statistical[i]
+            out[i] = flagged
+            if is_negative:
+                negative += 1
+            if is_high:
+                extreme_high += 1
+            if statistical[i]:
+                stat += 1
+            if flagged:
+                total += 1
+        return out, negative, extreme_high, stat, total
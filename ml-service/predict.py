@@ -725,7 +725,7 @@ def create_prediction_features(
 
     # In inference, we might only have a single row or a short window.
     # We use shift(1) per park to find changes.
-    was_raining = df.groupby("parkId")["is_raining"].shift(1).fillna(0)
+    was_raining = df.groupby("parkId")["is_raining"].shift(1, fill_value=0)
     df["is_rain_starting"] = ((df["is_raining"] == 1) & (was_raining == 0)).astype(int)
     df["is_rain_stopping"] = ((df["is_raining"] == 0) & (was_raining == 1)).astype(int)
 
@@ -907,17 +907,20 @@ def create_prediction_features(
         # (attractions × dates) rows but only (dates) distinct pairs per park.
         # Mirrors the same per-pair evaluation in features.py so the training
         # and inference feature paths stay byte-identical.
-        _pair_keys = list(zip(df["parkId"], df["date_str"]))
-        _unique_pairs = list(dict.fromkeys(_pair_keys))
+        # Per-pair results are gathered back to rows with the pair codes.
+        _pair_codes, _unique_pairs = pd.MultiIndex.from_arrays(
+            [df["parkId"], df["date_str"]]
+        ).factorize()
 
         for _slot in range(3):
-            _slot_lookup = {
-                pair: get_neighbor_key(pair[0], pair[1], _slot)
-                for pair in _unique_pairs
-            }
-            df[f"neighbor_{_slot + 1}_key"] = [
-                _slot_lookup[pair] for pair in _pair_keys
-            ]
+            _slot_keys = np.array(
+                [
+                    get_neighbor_key(park_id, date_str, _slot)
+                    for park_id, date_str in _unique_pairs
+                ],
+                dtype=object,
+            )
+            df[f"neighbor_{_slot + 1}_key"] = _slot_keys[_pair_codes]
 
         # Map to holiday types
         df["primary_type"] = df["primary_key"].map(holiday_type_lookup)
@@ -971,14 +974,17 @@ def create_prediction_features(
 
         # Same per-pair evaluation as the neighbor keys above: `local_date` is
         # what `date_str` was built from, so (parkId, date_str) is the full key.
+        # Counts come back as one (pairs, 2) int array of (school, public).
         _date_by_str = dict(zip(df["date_str"], df["local_date"]))
-        _counts_lookup = {
-            pair: _neighbor_counts(pair[0], pair[1], _date_by_str[pair[1]])
-            for pair in _unique_pairs
-        }
-        _counts = [_counts_lookup[pair] for pair in _pair_keys]
-        df["neighbor_school_holiday_count"] = [c[0] for c in _counts]
-        _neighbor_public = pd.Series([c[1] for c in _counts], index=df.index)
+        _counts = np.array(
+            [
+                _neighbor_counts(park_id, date_str, _date_by_str[date_str])
+                for park_id, date_str in _unique_pairs
+            ],
+            dtype=int,
+        ).reshape(-1, 2)[_pair_codes]
+        df["neighbor_school_holiday_count"] = _counts[:, 0]
+        _neighbor_public = _counts[:, 1]
 
         # Totals — full influencing-region aggregate (not just the 3 legacy slots).
         df["holiday_count_total"] = df["is_holiday_primary"] + _neighbor_public
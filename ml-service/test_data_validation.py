@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Equivalence tests for validate_training_data.
+
+Why this exists: the outlier/dedup/sufficiency passes run on NumPy arrays
+instead of pandas groupby. These tests pin the exact rows and report values
+the pandas implementation produced, so the rewrite cannot silently change
+which rows reach training.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_validation
+from data_validation import validate_training_data
+from outlier_kernels import NUMBA_AVAILABLE
+
+T0 = pd.Timestamp("2026-05-01 09:00", tz="UTC")
+
+
+@pytest.fixture(params=["numba", "numpy"])
+def kernels(request, monkeypatch):
+    """Run a test against both the Numba kernels and the NumPy fallback."""
+    if request.param == "numba" and not NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(data_validation, "NUMBA_AVAILABLE", request.param == "numba")
+    return request.param
+
+
+def build_df() -> pd.DataFrame:
+    """Three rides covering every removal path, shuffled."""
+    rows = []
+    # ride-a: 40 hourly samples 30..69, plus one statistical outlier (250)
+    for i in range(40):
+        rows.append(("ride-a", "park-1", T0 + pd.Timedelta(hours=i), 30 + i))
+    rows.append(("ride-a", "park-1", T0 + pd.Timedelta(hours=40), 250))
+    # ride-b: flat 20 min, plus a negative, a > 400 and a duplicate timestamp
+    for i in range(15):
+        rows.append(("ride-b", "park-1", T0 + pd.Timedelta(hours=i), 20))
+    rows.append(("ride-b", "park-1", T0 + pd.Timedelta(hours=15), -5))
+    rows.append(("ride-b", "park-1", T0 + pd.Timedelta(hours=16), 450))
+    rows.append(("ride-b", "park-1", T0 + pd.Timedelta(hours=3), 25))
+    # ride-c: only 4 samples -> insufficient
+    for i in range(4):
+        rows.append(("ride-c", "park-2", T0 + pd.Timedelta(hours=i), 10))
+    df = pd.DataFrame(rows, columns=["attractionId", "parkId", "timestamp", "waitTime"])
+    df["waitTime"] = df["waitTime"].astype(float)
+    return df.sample(frac=1.0, random_state=7).reset_index(drop=True)
+
+
+def reference_statistical_outliers(df: pd.DataFrame) -> pd.Series:
+    """The original pandas groupby IQR rule (Q3 + 3*IQR and > 200 min)."""
+    groups = df.groupby("attractionId")["waitTime"]
+    sizes = groups.size()
+    q1 = groups.quantile(0.25)
+    q3 = groups.quantile(0.75)
+    upper = df["attractionId"].map(q3 + 3 * (q3 - q1))
+    valid = df["attractionId"].isin(sizes[sizes >= 10].index)
+    return valid & (df["waitTime"] > upper) & (df["waitTime"] > 200)
+
+
+# --- Tests ----------------------------------------------------------------
+
+
+def test_report_matches_pandas_implementation(kernels):
+    _, report = validate_training_data(build_df())
+    assert report["initial_rows"] == 63
+    assert report["final_rows"] == 55
+    assert report["rows_removed"] == 8
+    assert report["attractions_count"] == 2
+    assert report["temporal_span_days"] == 1
+    assert report["issues"] == [
+        "Removed 3 extreme outliers (1 negative, 1 > 400 min, 2 statistical outliers)",
+        "Removed 1 duplicate timestamp entries",
+        "Removed 1 attractions with < 10 samples (4 rows)",
+        "Limited temporal coverage: only 1 days",
+    ]
+    stats = report["wait_time_stats"]
+    assert stats["mean"] == pytest.approx(41.45454545454545)
+    assert stats["median"] == 42.0
+    assert stats["std"] == pytest.approx(16.56839716181938)
+    assert (stats["min"], stats["max"]) == (20.0, 69.0)
+
+
+def test_duplicate_keeps_first_occurrence_in_input_order():
+    df = build_df()
+    out, _ = validate_training_data(df.copy())
+    dup_ts = T0 + pd.Timedelta(hours=3)
+    first = df[(df["attractionId"] == "ride-b") & (df["timestamp"] == dup_ts)].iloc[0]
+    kept = out[(out["attractionId"] == "ride-b") & (out["timestamp"] == dup_ts)]
+    assert kept["waitTime"].tolist() == [first["waitTime"]]
+
+
+def test_output_is_sorted_by_attraction_then_timestamp():
+    out, _ = validate_training_data(build_df())
+    expected = out.sort_values(["attractionId", "timestamp"])
+    assert out.index.tolist() == expected.index.tolist()
+
+
+def test_statistical_outliers_match_groupby_quantile_on_random_data(kernels):
+    rng = np.random.default_rng(42)
+    n = 20_000
+    df = pd.DataFrame(
+        {
+            "attractionId": rng.choice([f"ride-{i}" for i in range(60)], size=n),
+            "parkId": "park-1",
+            "timestamp": T0 + pd.to_timedelta(rng.integers(0, 90 * 24, n), unit="h"),
+            "waitTime": np.round(rng.gamma(2.0, 20.0, n)),
+        }
+    )
+    # Heavy right tail so the IQR rule actually fires
+    spikes = rng.choice(n, size=200, replace=False)
+    df.loc[spikes, "waitTime"] = rng.integers(201, 400, size=200)
+    # Missing waits are skipped by quantile() but still count in size()
+    df.loc[rng.choice(n, size=2_000, replace=False), "waitTime"] = np.nan
+    df.loc[df["attractionId"] == "ride-0", "waitTime"] = np.nan
+
+    expected = int(reference_statistical_outliers(df).sum())
+    assert expected > 0
+    _, report = validate_training_data(df)
+    assert f"{expected} statistical outliers" in report["issues"][0]
+
+
+def test_id_columns_are_categorical_without_removed_attractions():
+    out, _ = validate_training_data(build_df())
+    assert isinstance(out["attractionId"].dtype, pd.CategoricalDtype)
+    assert sorted(out["attractionId"].cat.categories) == ["ride-a", "ride-b"]
+    assert sorted(out["parkId"].cat.categories) == ["park-1"]
+
+
+def test_dedup_matches_drop_duplicates_on_random_data():
+    rng = np.random.default_rng(3)
+    n = 5_000
+    df = pd.DataFrame(
+        {
+            "attractionId": rng.choice([f"ride-{i}" for i in range(12)], size=n),
+            "parkId": "park-1",
+            # Few distinct hours -> many colliding (attraction, timestamp) keys
+            "timestamp": T0 + pd.to_timedelta(rng.integers(0, 24 * 40, n), unit="h"),
+            "waitTime": rng.integers(0, 120, n).astype(float),
+        }
+    )
+    expected = df.drop_duplicates(subset=["attractionId", "timestamp"], keep="first")
+    out, report = validate_training_data(df.copy())
+    assert f"Removed {n - len(expected)} duplicate" in report["issues"][0]
+    pd.testing.assert_frame_equal(
+        out.astype({"attractionId": str, "parkId": str}),
+        expected.sort_values(["attractionId", "timestamp"]),
+    )
+
+
+def test_clean_sorted_input_is_returned_without_copy():
+    df = build_df()
+    df = df[df["attractionId"] == "ride-a"].sort_values("timestamp")
+    df = df[df["waitTime"] < 200]
+    out, report = validate_training_data(df)
+    assert out is df
+    assert report["rows_removed"] == 0
+
+
+def test_all_attractions_insufficient_returns_empty_frame():
+    df = build_df()
+    df = df[df["attractionId"] == "ride-c"]
+    out, report = validate_training_data(df)
+    assert out.empty
+    assert report["final_rows"] == 0
+    assert report["attractions_count"] == 0
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Regression tests for convert_to_local_time.
+
+Why this exists: writing each park's tz_convert result back into the shared
+tz-aware UTC column looks right but pandas casts it back to UTC (or, on older
+versions, to object dtype), so every "local" hour/day feature silently used
+UTC. These tests pin the naive local datetime64[ns] column the time features
+are derived from.
+"""
+
+import pandas as pd
+
+from features import convert_to_local_time
+
+PARKS_METADATA = pd.DataFrame(
+    [
+        {"park_id": "park-berlin", "timezone": "Europe/Berlin"},
+        {"park_id": "park-orlando", "timezone": "America/New_York"},
+        {"park_id": "park-no-tz", "timezone": None},
+    ]
+)
+
+
+def build_df() -> pd.DataFrame:
+    ts = pd.Timestamp("2026-07-01 10:00", tz="UTC")
+    return pd.DataFrame(
+        {
+            "parkId": ["park-orlando", "park-berlin", "park-no-tz", "park-berlin"],
+            "timestamp": [ts, ts, ts, ts + pd.Timedelta(hours=13)],
+        }
+    )
+
+
+# --- Tests ----------------------------------------------------------------
+
+
+def test_local_timestamp_is_naive_datetime64():
+    out = convert_to_local_time(build_df(), PARKS_METADATA)
+    assert out["local_timestamp"].dtype == "datetime64[ns]"
+    assert str(out["timestamp"].dtype) == "datetime64[ns, UTC]"
+
+
+def test_each_park_gets_its_own_wall_time():
+    out = convert_to_local_time(build_df(), PARKS_METADATA)
+    assert out["local_timestamp"].tolist() == [
+        pd.Timestamp("2026-07-01 06:00"),  # EDT = UTC-4
+        pd.Timestamp("2026-07-01 12:00"),  # CEST = UTC+2
+        pd.Timestamp("2026-07-01 10:00"),  # no timezone: stays UTC
+        pd.Timestamp("2026-07-02 01:00"),  # crosses local midnight
+    ]
+
+
+def test_categorical_park_ids_and_naive_input():
+    df = build_df()
+    df["parkId"] = df["parkId"].astype("category")
+    df["timestamp"] = df["timestamp"].dt.tz_localize(None)
+    out = convert_to_local_time(df, PARKS_METADATA)
+    assert out["local_timestamp"].dt.hour.tolist() == [6, 12, 10, 1]
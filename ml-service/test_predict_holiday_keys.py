@@ -4,7 +4,7 @@ Pins the two mechanical rewrites in predict.py's holiday-feature block:
 
   1. `primary_key` is built with vector ops instead of a row-wise apply.
   2. neighbor keys / counts are evaluated once per unique (parkId, date_str)
-     pair and mapped back positionally.
+     pair and gathered back to rows with the pair codes.
 
 Both must be indistinguishable from the row-wise versions they replaced —
 predict.py (inference) and features.py (training) have to stay byte-identical,
@@ -87,18 +87,29 @@ def test_per_pair_mapping_preserves_row_order():
         return ""
 
     pair_keys = list(zip(df["parkId"], df["date_str"]))
-    unique_pairs = list(dict.fromkeys(pair_keys))
+    pair_codes, unique_pairs = pd.MultiIndex.from_arrays(
+        [df["parkId"], df["date_str"]]
+    ).factorize()
 
     # The pair list must actually collapse work, otherwise the test is vacuous.
     assert len(unique_pairs) == 6
     assert len(pair_keys) == 24
 
     for slot in range(3):
-        lookup = {p: key_for(p[0], p[1], slot) for p in unique_pairs}
-        actual = [lookup[p] for p in pair_keys]
+        slot_keys = np.array(
+            [key_for(park, day, slot) for park, day in unique_pairs], dtype=object
+        )
+        actual = list(slot_keys[pair_codes])
         expected = [key_for(park, day, slot) for park, day in pair_keys]
         assert actual == expected, f"slot {slot}"
 
+    # Counts are gathered the same way from a (pairs, 2) array
+    counts = np.array(
+        [(len(park), int(day[-1])) for park, day in unique_pairs], dtype=int
+    ).reshape(-1, 2)[pair_codes]
+    assert counts[:, 0].tolist() == [len(park) for park, _ in pair_keys]
+    assert counts[:, 1].tolist() == [int(day[-1]) for _, day in pair_keys]
+
 
 def test_date_str_to_local_date_mapping_is_unambiguous():
     """
@@ -50,7 +50,9 @@ for interval in RESAMPLING_INTERVALS:
 
     # Simple resampling
     resampled_parts = []
-    for (attraction_id, park_id), group in df.groupby(["attractionId", "parkId"]):
+    for (attraction_id, park_id), group in df.groupby(
+        ["attractionId", "parkId"], observed=True
+    ):
         group = group.set_index("timestamp").sort_index()
 
         # Aggregate
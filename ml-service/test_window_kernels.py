@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Equivalence tests for the time-windowed historical feature helpers.
+
+Why this exists: the avg_wait_* / rolling_avg_* features are computed on
+sorted NumPy arrays (Numba kernel or prefix sums) instead of pandas
+groupby().rolling(). These tests pin them to the pandas results, including
+the closed="left" window edge, so the rewrite cannot leak the current row.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import features
+from window_kernels import NUMBA_AVAILABLE
+
+T0 = pd.Timestamp("2026-05-01 09:00", tz="UTC")
+
+
+@pytest.fixture(params=["numba", "numpy"])
+def kernels(request, monkeypatch):
+    """Run a test against both the Numba kernel and the NumPy fallback."""
+    if request.param == "numba" and not NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(features, "NUMBA_AVAILABLE", request.param == "numba")
+    return request.param
+
+
+def build_df() -> pd.DataFrame:
+    """Random irregular samples for 20 rides, with gaps and missing waits."""
+    rng = np.random.default_rng(11)
+    n = 10_000
+    df = pd.DataFrame(
+        {
+            "attractionId": rng.choice([f"ride-{i}" for i in range(20)], size=n),
+            "timestamp": T0
+            + pd.to_timedelta(rng.integers(0, 60 * 24 * 100, n), unit="min"),
+            "waitTime": np.where(rng.random(n) < 0.1, np.nan, rng.gamma(2.0, 17.5, n)),
+        }
+    )
+    df["attractionId"] = df["attractionId"].astype("category")
+    return df.sort_values(["attractionId", "timestamp"]).reset_index(drop=True)
+
+
+def run(df: pd.DataFrame, window: str) -> np.ndarray:
+    ts = df["timestamp"].values.astype("datetime64[ns]").view("int64")
+    bounds = features._group_bounds(df["attractionId"])
+    return features._rolling_mean(ts, df["waitTime"].to_numpy(), bounds, window)
+
+
+# --- Tests ----------------------------------------------------------------
+
+
+@pytest.mark.parametrize("window", ["1h", "24h", "7d", "90d"])
+def test_rolling_mean_matches_pandas_closed_left(kernels, window):
+    df = build_df()
+    expected = (
+        df.set_index("timestamp")
+        .groupby("attractionId", observed=True)["waitTime"]
+        .rolling(window, closed="left", min_periods=1)
+        .mean()
+        .values
+    )
+    np.testing.assert_allclose(run(df, window), expected, rtol=1e-6, atol=1e-6)
+
+
+def test_window_excludes_current_and_expired_rows(kernels):
+    df = pd.DataFrame(
+        {
+            "attractionId": ["a", "a", "a", "a", "b"],
+            "timestamp": [
+                T0,
+                T0 + pd.Timedelta(minutes=30),
+                T0 + pd.Timedelta(minutes=30),  # same timestamp: not in window
+                T0 + pd.Timedelta(minutes=90),  # T0 has expired
+                T0 + pd.Timedelta(minutes=40),  # other ride: never mixed in
+            ],
+            "waitTime": [10.0, 20.0, 40.0, 5.0, 99.0],
+        }
+    )
+    out = run(df, "1h")
+    assert np.isnan(out[0])
+    assert out[1] == 10.0
+    assert out[2] == 10.0
+    assert out[3] == 30.0
+    assert np.isnan(out[4])
+
+
+@pytest.mark.parametrize("window", ["1h", "7d"])
+def test_rolling_std_matches_pandas_closed_left(kernels, window):
+    df = build_df()
+    expected = (
+        df.set_index("timestamp")
+        .groupby("attractionId", observed=True)["waitTime"]
+        .rolling(window, closed="left", min_periods=2)
+        .std()
+        .values
+    )
+    ts = df["timestamp"].values.astype("datetime64[ns]").view("int64")
+    bounds = features._group_bounds(df["attractionId"])
+    out = features._rolling_std(ts, df["waitTime"].to_numpy(), bounds, window)
+    np.testing.assert_allclose(out, expected, rtol=1e-6, atol=1e-6)
+
+
+def test_empty_window_fill(kernels):
+    df = pd.DataFrame(
+        {
+            "attractionId": ["a", "a", "a"],
+            "timestamp": [T0, T0 + pd.Timedelta(minutes=10), T0 + pd.Timedelta(days=2)],
+            "waitTime": [10.0, 20.0, 30.0],
+        }
+    )
+    ts = df["timestamp"].values.astype("datetime64[ns]").view("int64")
+    bounds = features._group_bounds(df["attractionId"])
+    wait = df["waitTime"].to_numpy()
+    mean = features._rolling_mean(ts, wait, bounds, "1h", fill=0.0)
+    std = features._rolling_std(ts, wait, bounds, "1h", fill=0.0)
+    assert mean.tolist() == [0.0, 10.0, 0.0]
+    assert std.tolist() == [0.0, 0.0, 0.0]
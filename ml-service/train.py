@@ -52,14 +52,14 @@ def remove_anomalies(df: pd.DataFrame) -> pd.DataFrame:
 
     # Calculate rolling median (centered) to determine "context" for sudden drops
     # We use a centered window to see what's happening around the data point for this ride
-    df["rolling_median"] = df.groupby("attractionId")["waitTime"].transform(
-        lambda x: x.rolling(window=7, min_periods=1, center=True).median()
-    )
+    df["rolling_median"] = df.groupby("attractionId", observed=True)[
+        "waitTime"
+    ].transform(lambda x: x.rolling(window=7, min_periods=1, center=True).median())
 
     # Calculate park-wide median at each timestamp to detect technical heartbeats
     # (Fake 5 min waits before park or area opening)
     park_medians = (
-        df.groupby(["parkId", "timestamp"])["waitTime"]
+        df.groupby(["parkId", "timestamp"], observed=True)["waitTime"]
         .median()
         .reset_index()
         .rename(columns={"waitTime": "park_timestamp_median"})
@@ -87,10 +87,12 @@ def remove_anomalies(df: pd.DataFrame) -> pd.DataFrame:
     # Combine masks
     anomaly_mask = drop_mask | high_outlier_mask | heartbeat_mask
 
-    df_clean = df[~anomaly_mask].copy()
-    df_clean = df_clean.drop(
-        columns=["rolling_median", "park_timestamp_median", "opening_hour"]
-    )
+    # Select kept rows and drop the helper columns in one .loc (one frame
+    # allocation instead of mask + copy + drop)
+    df_clean = df.loc[
+        ~anomaly_mask,
+        df.columns.drop(["rolling_median", "park_timestamp_median", "opening_hour"]),
+    ]
 
     removed_drops = drop_mask.sum()
     removed_highs = high_outlier_mask.sum()
@@ -0,0 +1,77 @@
+"""
+Numba-compiled kernels for time-windowed historical features
+
+Numba is optional: when it is not installed NUMBA_AVAILABLE is False and
+callers fall back to the NumPy implementation in features.py.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, cache=True)
+    def window_sums(
+        ts: np.ndarray,
+        values: np.ndarray,
+        group_starts: np.ndarray,
+        group_ends: np.ndarray,
+        window: int,
+    ) -> tuple:
+        """
+        Sum, sum of squares and count of the non-NaN values in [ts - window, ts)
+
+        Matches pandas rolling(window, closed="left") within each group.
+        Rows must be sorted by group, then timestamp.
+
+        Args:
+            ts: Timestamps as int64 nanoseconds
+            values: Values to aggregate (NaN is skipped)
+            group_starts: First row of each group
+            group_ends: One past the last row of each group
+            window: Window length in nanoseconds
+
+        Returns:
+            Tuple of (sums, sums of squares, counts) per row
+        """
+        n = len(values)
+        sums = np.zeros(n, dtype=np.float64)
+        squares = np.zeros(n, dtype=np.float64)
+        counts = np.zeros(n, dtype=np.int64)
+        for g in prange(len(group_starts)):
+            start = group_starts[g]
+            end = group_ends[g]
+            left = start
+            right = start
+            total = 0.0
+            total_sq = 0.0
+            count = 0
+            for i in range(start, end):
+                # Two pointers: admit everything strictly before ts[i] ...
+                while right < end and ts[right] < ts[i]:
+                    if not np.isnan(values[right]):
+                        total += values[right]
+                        total_sq += values[right] * values[right]
+                        count += 1
+                    right += 1
+                # ... and evict everything older than ts[i] - window
+                while left < right and ts[left] < ts[i] - window:
+                    if not np.isnan(values[left]):
+                        total -= values[left]
+                        total_sq -= values[left] * values[left]
+                        count -= 1
+                    left += 1
+                if count == 0:
+                    total = 0.0  # drop accumulated rounding error
+                    total_sq = 0.0
+                sums[i] = total
+                squares[i] = total_sq
+                counts[i] = count
+        return sums, squares, counts